@@ -0,0 +1,473 @@
+import random
+import time
+
+from board import HIT
+from cellpool import CellPool
+from density import DensityTracker
+from endgame import EndgameSolver
+from fleet import FLEET
+from placements import generate_consistent_fleet, get_placement_table
+from symmetry import CanonicalKnowledgeHash
+from zobrist import KnowledgeHash, get_zobrist_keys
+
+
+class Strategy:
+    """
+    Base des stratégies de tir de l'ordinateur.
+    Une stratégie ne connaît que ce que le tireur voit : ses tirs, leurs
+    résultats et les navires coulés. Le moteur appelle choose() pour
+    obtenir la case visée, puis record() avec le résultat du tir.
+    """
+    name = None
+    # Choix assez coûteux pour qu'un cache de décisions fasse gagner du temps
+    cached = False
+
+    def __init__(self, rng=None, board_size=10, fleet=FLEET):
+        self.rng = rng if rng is not None else random.Random()
+        self.board_size = board_size
+        self.fleet = fleet
+
+        # Cases encore jamais visées (tirage uniforme en O(1))
+        self.targets = CellPool(board_size)
+
+    def choose(self):
+        """
+        Renvoie la case (row, col) à viser, jamais déjà visée.
+        """
+        raise NotImplementedError
+
+    def record(self, row, col, result, sunk=None):
+        """
+        Enregistre le résultat (HIT / MISS) d'un tir ; sunk est le navire
+        (fleet.Ship) coulé par ce tir, ou None.
+        """
+        self.targets.remove(row, col)
+
+    def random_shot(self):
+        return self.targets.draw(self.rng)
+
+    @classmethod
+    def knowledge_hash(cls, board_size, fleet):
+        """
+        Hash de Zobrist de la connaissance du tireur que le moteur tient à
+        jour pour cette stratégie (zobrist.KnowledgeHash : un XOR par tir).
+        """
+        return KnowledgeHash(get_zobrist_keys(board_size, fleet))
+
+
+class RandomStrategy(Strategy):
+    """
+    "facile" : tir au hasard sur une case non visée.
+    """
+    name = "facile"
+
+    def choose(self):
+        return self.random_shot()
+
+
+class HuntStrategy(Strategy):
+    """
+    "difficile" : après une touche, vise une case voisine non visée de la
+    dernière touche ; un raté lui fait oublier cette touche.
+    """
+    name = "difficile"
+
+    def __init__(self, rng=None, board_size=10, fleet=FLEET):
+        super().__init__(rng, board_size, fleet)
+        # Dernier tir réussi
+        self.last_hit = None
+
+    def choose(self):
+        if self.last_hit is not None:
+            row, col = self.find_adjacent_shot(*self.last_hit)
+            if row is not None:
+                return row, col
+        return self.random_shot()
+
+    def record(self, row, col, result, sunk=None):
+        super().record(row, col, result, sunk)
+        self.last_hit = (row, col) if result == HIT else None
+
+    def find_adjacent_shot(self, row, col):
+        candidates = []
+        last = self.board_size - 1
+        # up
+        if row > 0 and (row-1, col) in self.targets:
+            candidates.append((row-1, col))
+        # down
+        if row < last and (row+1, col) in self.targets:
+            candidates.append((row+1, col))
+        # left
+        if col > 0 and (row, col-1) in self.targets:
+            candidates.append((row, col-1))
+        # right
+        if col < last and (row, col+1) in self.targets:
+            candidates.append((row, col+1))
+
+        if not candidates:
+            return (None, None)
+        return self.rng.choice(candidates)
+
+
+class KnowledgeStrategy(Strategy):
+    """
+    Base des stratégies qui raisonnent sur ce que le tireur a observé :
+    ratés, touches non résolues et navires coulés (masques de bits), et
+    tailles des navires encore à flot.
+
+    Avec endgame=True, en fin de partie (au plus deux navires à flot et
+    peu de positions possibles pour eux), le tir est choisi par le solveur
+    exact (endgame.py), dans la limite de sa part du budget du coup
+    (activé par défaut). Sinon par choose_shot(), propre à chaque
+    stratégie, dont le résultat est mémorisé dans cache
+    (decision_cache.DecisionCache, partagé entre parties) sous le hash
+    de Zobrist de la connaissance,
+    ramené si le cache est symétrique au représentant de son orbite par
+    les symétries du plateau (symmetry.py). Pendant les premiers coups,
+    le livre d'ouvertures book (opening_book.OpeningBook) passe avant.
+
+    knowledge est ce hash (symmetry.CanonicalKnowledgeHash), tenu à jour
+    par le moteur qui le partage avec la stratégie ; sans moteur
+    (knowledge=None), la stratégie tient le sien dans record().
+
+    budget est le temps alloué à un coup (en secondes, None : illimité) :
+    choose() en fixe l'échéance self.deadline, dont le solveur de fin de
+    partie ne prend qu'une part (ENDGAME_SHARE) pour en laisser à
+    choose_shot() s'il échoue.
+    """
+    ENDGAME_SHARE = 0.5
+    SCAN_STEP = 64
+
+    def __init__(self, rng=None, board_size=10, fleet=FLEET, endgame=True, cache=None, book=None,
+                 budget=None, knowledge=None):
+        super().__init__(rng, board_size, fleet)
+        self.table = get_placement_table(board_size, fleet)
+        self.endgame = EndgameSolver(self.table) if endgame else None
+        self.budget = budget
+        self.deadline = None
+        self.cache = cache
+        self.book = book
+        self.own_knowledge = knowledge is None
+        self.knowledge = knowledge if knowledge is not None else self.knowledge_hash(board_size, fleet)
+
+        # Connaissance du tireur (masques de bits)
+        self.misses = 0
+        self.open_hits = 0     # touches sur des navires pas encore coulés
+        self.sunk_cells = 0
+        self.open_hit_cells = set()
+        # Tailles des navires non coulés : {taille: nombre}
+        self.remaining = {}
+        for _, size in fleet:
+            self.remaining[size] = self.remaining.get(size, 0) + 1
+
+    def record(self, row, col, result, sunk=None):
+        super().record(row, col, result, sunk)
+        cell = row * self.board_size + col
+        bit = 1 << cell
+        if self.own_knowledge:
+            self.knowledge.shot(row, col, result)
+            if sunk is not None:
+                self.knowledge.sink(sunk)
+        if result == HIT:
+            self.open_hits |= bit
+            self.open_hit_cells.add(cell)
+        else:
+            self.misses |= bit
+        ship_mask = sunk.mask(self.board_size) if sunk is not None else None
+        if self.endgame is not None:
+            self.endgame.observe(cell, result, ship_mask)
+        if sunk is not None:
+            self.open_hits &= ~ship_mask
+            self.open_hit_cells.difference_update(self.ship_cells(sunk))
+            self.sunk_cells |= ship_mask
+            self.remaining[sunk.size] -= 1
+            if not self.remaining[sunk.size]:
+                del self.remaining[sunk.size]
+
+    @classmethod
+    def knowledge_hash(cls, board_size, fleet):
+        # Les 8 repères du plateau, pour les clés invariantes par symétrie
+        return CanonicalKnowledgeHash(board_size, fleet)
+
+    def choose(self):
+        start = time.perf_counter()
+        self.deadline = start + self.budget if self.budget is not None else None
+        if self.endgame is not None:
+            sizes = [size for size, count in self.remaining.items() for _ in range(count)]
+            deadline = start + self.budget * self.ENDGAME_SHARE if self.budget is not None else None
+            cell = self.endgame.solve(sizes, self.misses | self.sunk_cells, self.open_hits,
+                                      self.misses | self.open_hits | self.sunk_cells, deadline)
+            if cell is not None:
+                return divmod(cell, self.board_size)
+        symmetry = self.knowledge.symmetry
+        if self.book is not None and self.board_size ** 2 - len(self.targets) < self.book.depth:
+            key, t = self.knowledge.canonical()
+            cell = self.book.lookup(key)
+            if cell is not None:
+                row, col = self.from_frame(cell, t)
+                if (row, col) in self.targets:
+                    return row, col
+        if self.cache is None:
+            return self.choose_shot()
+
+        if self.cache.symmetric:
+            key, t = self.knowledge.canonical()
+        else:
+            key, t = self.knowledge.values[0], 0
+        cell = self.cache.get(key)
+        if cell is not None:
+            row, col = self.from_frame(cell, t)
+            if (row, col) in self.targets:
+                return row, col
+        row, col = self.choose_shot()
+        self.cache.put(key, symmetry.cell_maps[t][row * self.board_size + col])
+        return row, col
+
+    def from_frame(self, cell, t):
+        """
+        Case (row, col) du plateau correspondant à une case stockée dans le
+        repère de la symétrie t (celui de la clé canonique).
+        """
+        symmetry = self.knowledge.symmetry
+        return divmod(symmetry.cell_maps[symmetry.inverse[t]][cell], self.board_size)
+
+    def choose_shot(self):
+        """
+        Case à viser hors fin de partie, si possible avant self.deadline.
+        """
+        raise NotImplementedError
+
+    def ship_cells(self, ship):
+        return [r * self.board_size + c for (r, c) in ship.coordinates]
+
+    def remaining_fleet(self):
+        """
+        Navires encore à flot, au format [(nom, taille), ...].
+        """
+        return [("", size) for size, count in self.remaining.items() for _ in range(count)]
+
+    def best_cell(self, score, deadline=None):
+        """
+        Case non visée de score maximal (égalités tirées au hasard), ou
+        None si aucune case n'a un score positif. Passé l'échéance
+        deadline, on s'arrête à la meilleure des cases déjà examinées
+        (échéance vérifiée toutes les SCAN_STEP cases).
+        """
+        best = 0
+        candidates = []
+        cells = self.targets.cells
+        for start in range(0, len(cells), self.SCAN_STEP):
+            if start and deadline is not None and time.perf_counter() > deadline:
+                break
+            for cell in cells[start:start + self.SCAN_STEP]:
+                value = score(cell)
+                if value > best:
+                    best = value
+                    candidates = [cell]
+                elif value == best and best > 0:
+                    candidates.append(cell)
+        if not candidates:
+            return None
+        return divmod(self.rng.choice(candidates), self.board_size)
+
+
+class DensityStrategy(KnowledgeStrategy):
+    """
+    "expert" : pour chaque case, compte les placements légaux des navires
+    non coulés qui la couvrent, compte tenu des ratés, des touches et des
+    navires coulés, puis tire sur la case la plus dense. Un placement qui
+    couvre k touches pas encore attribuées à un navire coulé pèse
+    HIT_WEIGHT ** k, ce qui concentre les tirs autour des touches.
+
+    Par défaut la carte est tenue à jour incrémentalement (density.py).
+    Avec incremental=False, elle est recalculée à chaque coup. Dans les
+    deux cas le calcul s'arrête à l'échéance du coup, moins le temps pris
+    par le dernier parcours des cases (réservé à best_cell) : on tire alors
+    sur la meilleure case de la carte partielle.
+    """
+    name = "expert"
+    HIT_WEIGHT = 50
+    HEATMAP_STEP = 8
+
+    def __init__(self, rng=None, board_size=10, fleet=FLEET, budget=0.005, incremental=True,
+                 endgame=True, cache=None, book=None, knowledge=None):
+        super().__init__(rng, board_size, fleet, endgame, cache, book, budget, knowledge)
+        self.incremental = incremental
+
+        # Densité incrémentale, et surplus dû aux touches au dernier coup
+        self.tracker = DensityTracker(self.table, fleet) if incremental else None
+        if self.tracker is None:
+            # Placements construits ici plutôt que sur le budget du premier coup
+            for size in self.remaining:
+                self.table.legal(size)
+        self.bonus = {}
+
+        # Dernière carte recalculée (mode non incrémental), indexée par row * n + col
+        self.heat = [0] * (board_size * board_size)
+        # Durée du dernier parcours des cases par best_cell (secondes)
+        self.scan_time = 0.0
+
+    def record(self, row, col, result, sunk=None):
+        super().record(row, col, result, sunk)
+        if self.tracker is None:
+            return
+        if result != HIT:
+            self.tracker.block(row * self.board_size + col)
+        if sunk is not None:
+            self.tracker.sink(self.ship_cells(sunk), sunk.size)
+
+    def compute_heatmap(self, deadline=None):
+        """
+        Recalcule self.heat depuis zéro. Renvoie False si l'échéance a
+        interrompu le calcul.
+        """
+        heat = [0] * (self.board_size * self.board_size)
+        blocked = self.misses | self.sunk_cells
+        open_hits = self.open_hits
+        complete = True
+        # Les grands navires d'abord : ce sont les plus informatifs
+        for size in sorted(self.remaining, reverse=True):
+            count = self.remaining[size]
+            for index, placement in enumerate(self.table.legal(size)):
+                if index % self.HEATMAP_STEP == 0 and deadline is not None and time.perf_counter() > deadline:
+                    complete = False
+                    break
+                mask = placement[3]
+                if mask & blocked:
+                    continue
+                weight = count * self.HIT_WEIGHT ** (mask & open_hits).bit_count()
+                for cell in placement[4]:
+                    heat[cell] += weight
+            if not complete:
+                break
+        self.heat = heat
+        return complete
+
+    def current_heat(self):
+        """
+        Carte de densité à jour, indexée par row * n + col.
+        """
+        if self.tracker is None:
+            return self.heat
+        heat = list(self.tracker.heat)
+        for cell, extra in self.bonus.items():
+            heat[cell] += extra
+        return heat
+
+    def heatmap(self):
+        """
+        Dernière carte de densité, en grille [row][col] (pour le débogage).
+        """
+        n = self.board_size
+        heat = self.current_heat()
+        return [heat[row * n:(row + 1) * n] for row in range(n)]
+
+    def choose_shot(self):
+        deadline = self.deadline
+        if deadline is not None:
+            deadline -= self.scan_time
+        if self.tracker is None:
+            self.compute_heatmap(deadline)
+            heat = self.heat
+            bonus = {}
+        else:
+            heat = self.tracker.heat
+            if self.open_hit_cells:
+                self.bonus = self.tracker.target_bonus(self.open_hit_cells, self.open_hits, self.HIT_WEIGHT,
+                                                       deadline)
+            else:
+                self.bonus = {}
+            bonus = self.bonus
+
+        start = time.perf_counter()
+        cell = self.best_cell(lambda cell: heat[cell] + bonus.get(cell, 0), self.deadline)
+        self.scan_time = time.perf_counter() - start
+        if cell is None:
+            return self.random_shot()
+        return cell
+
+
+class MonteCarloStrategy(KnowledgeStrategy):
+    """
+    "montecarlo" : tire des flottes complètes compatibles avec tout ce qui
+    a été observé (placements.generate_consistent_fleet) et vise la case
+    non visée la plus souvent occupée dans ces échantillons.
+
+    Algorithme "anytime" : on échantillonne jusqu'à l'échéance budget (en
+    secondes, sous les 500 ms de pause de l'interface) ou max_samples
+    tirages, réussis ou non, puis on répond avec les comptes obtenus.
+    """
+    name = "montecarlo"
+    cached = True
+
+    def __init__(self, rng=None, board_size=10, fleet=FLEET, budget=0.25, max_samples=1000,
+                 endgame=True, cache=None, book=None, knowledge=None):
+        super().__init__(rng, board_size, fleet, endgame, cache, book, budget, knowledge)
+        self.max_samples = max_samples
+
+        # Occupation comptée au dernier coup, indexée par row * n + col
+        self.counts = [0] * (board_size * board_size)
+        self.samples = 0
+
+    def sample(self, deadline=None):
+        """
+        Échantillonne jusqu'à l'échéance, sans dépasser max_samples tirages
+        (les tirages qui échouent comptent : sans échéance, rien d'autre ne
+        les bornerait) ; remplit self.counts.
+        """
+        counts = [0] * (self.board_size * self.board_size)
+        fleet = self.remaining_fleet()
+        forbidden = self.misses | self.sunk_cells
+        samples = 0
+        attempts = 0
+        while attempts < self.max_samples and (deadline is None or time.perf_counter() < deadline):
+            attempts += 1
+            placements = generate_consistent_fleet(
+                self.board_size, fleet, self.rng, forbidden, self.open_hits)
+            if placements is None:
+                continue
+            for placement in placements:
+                for cell in placement[4]:
+                    counts[cell] += 1
+            samples += 1
+        self.counts = counts
+        self.samples = samples
+
+    def heatmap(self):
+        """
+        Occupation comptée au dernier coup, en grille [row][col].
+        """
+        n = self.board_size
+        return [self.counts[row * n:(row + 1) * n] for row in range(n)]
+
+    def choose_shot(self):
+        self.sample(self.deadline)
+        counts = self.counts
+        cell = self.best_cell(counts.__getitem__)
+        if cell is None:
+            return self.random_shot()
+        return cell
+
+
+# Stratégies disponibles, par nom de difficulté
+STRATEGIES = {
+    RandomStrategy.name: RandomStrategy,
+    HuntStrategy.name: HuntStrategy,
+    DensityStrategy.name: DensityStrategy,
+    MonteCarloStrategy.name: MonteCarloStrategy,
+}
+
+# Stratégies dont les décisions valent d'être mises en cache : pour
+# l'expert, la recherche dans le cache coûte plus cher que le coup
+CACHED_STRATEGIES = [name for name, strategy in STRATEGIES.items() if strategy.cached]
+
+
+def make_strategy(name, rng=None, board_size=10, fleet=FLEET, cache=None, book=None, **options):
+    """
+    Crée la stratégie name ; cache (DecisionCache), book (OpeningBook) et
+    les options propres à la stratégie (budget, max_samples...) ne servent
+    qu'aux stratégies qui raisonnent sur la connaissance du tireur.
+    """
+    if issubclass(STRATEGIES[name], KnowledgeStrategy):
+        return STRATEGIES[name](rng, board_size, fleet, cache=cache, book=book, **options)
+    return STRATEGIES[name](rng, board_size, fleet)
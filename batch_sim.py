@@ -0,0 +1,194 @@
+"""
+Simulateur en lot : N parties jouées en parallèle avec NumPy.
+
+Chaque plateau est une ligne d'un tableau (N, 100) de booléens ; un pas
+de simulation fait tirer le joueur puis l'ordinateur dans toutes les
+parties encore en cours. Mêmes règles que le moteur (engine.py) :
+  - le "joueur" tire au hasard sur les cases non visées (comme simulate_game),
+  - "facile" : l'ordinateur tire au hasard sur les cases non visées,
+  - "difficile" : après une touche, il vise une case voisine non visée de
+    la dernière touche ; un raté lui fait oublier cette touche.
+"""
+import random
+import time
+
+import numpy as np
+
+from fleet import FLEET
+from placements import generate_fleets
+
+PLAYER = 0
+COMPUTER = 1
+
+
+def neighbour_table(n):
+    """
+    Pour chaque case, les indices des voisines haut/bas/gauche/droite (-1 = hors plateau).
+    """
+    table = np.full((n * n, 4), -1, dtype=np.int64)
+    for row in range(n):
+        for col in range(n):
+            index = row * n + col
+            if row > 0:
+                table[index, 0] = index - n
+            if row < n - 1:
+                table[index, 1] = index + n
+            if col > 0:
+                table[index, 2] = index - 1
+            if col < n - 1:
+                table[index, 3] = index + 1
+    return table
+
+
+def random_fleet_boards(n_games, rng, board_size=10, fleet=FLEET):
+    """
+    Tableau (n_games, board_size**2) de booléens : cases occupées par une flotte.
+    """
+    n_bytes = (board_size * board_size + 7) // 8
+    raw = bytearray()
+    for placements in generate_fleets(board_size, fleet, n_games, rng):
+        mask = 0
+        for placement in placements:
+            mask |= placement[3]
+        raw += mask.to_bytes(n_bytes, "little")
+    packed = np.frombuffer(bytes(raw), dtype=np.uint8).reshape(n_games, n_bytes)
+    bits = np.unpackbits(packed, axis=1, bitorder="little")
+    return bits[:, :board_size * board_size].astype(bool)
+
+
+class BatchSimulator:
+    """
+    Joue n_games parties complètes en parallèle.
+    Après run() :
+      - winners[i] : PLAYER ou COMPUTER,
+      - player_shots[i] / computer_shots[i] : nombre de tirs de chaque camp.
+    """
+
+    def __init__(self, n_games, difficulty="facile", seed=None):
+        self.n_games = n_games
+        self.difficulty = difficulty
+        self.rng = np.random.default_rng(seed)
+        fleet_rng = random.Random(seed)
+
+        n = 10
+        self.cells = n * n
+        self.neighbours = neighbour_table(n)
+        self.ship_cells = sum(size for _, size in FLEET)
+
+        # Plateaux (True = navire)
+        self.player_ships = random_fleet_boards(n_games, fleet_rng)
+        self.computer_ships = random_fleet_boards(n_games, fleet_rng)
+
+        # Cases déjà visées sur chaque plateau
+        self.player_shots_done = np.zeros((n_games, self.cells), dtype=bool)
+        self.computer_shots_done = np.zeros((n_games, self.cells), dtype=bool)
+
+        # Ordre de tir aléatoire du joueur (une permutation par partie)
+        self.player_order = np.argsort(self.rng.random((n_games, self.cells)), axis=1)
+
+        # Tirs aléatoires de l'ordinateur : on parcourt aussi une permutation
+        # en sautant les cases déjà visées (par un tir "difficile"), ce qui
+        # revient à un tirage uniforme parmi les cases non visées
+        self.computer_order = np.argsort(self.rng.random((n_games, self.cells)), axis=1)
+        self.computer_next = np.zeros(n_games, dtype=np.int64)
+
+        self.player_hits = np.zeros(n_games, dtype=np.int64)
+        self.computer_hits = np.zeros(n_games, dtype=np.int64)
+        self.player_shots = np.zeros(n_games, dtype=np.int64)
+        self.computer_shots = np.zeros(n_games, dtype=np.int64)
+        self.last_computer_hit = np.full(n_games, -1, dtype=np.int64)
+        self.winners = np.full(n_games, -1, dtype=np.int8)
+
+    def run(self):
+        active = np.arange(self.n_games)
+        turn = 0
+        while active.size:
+            active = self.player_step(active, turn)
+            active = self.computer_step(active)
+            turn += 1
+        return self
+
+    def player_step(self, active, turn):
+        """
+        Tir du joueur dans toutes les parties actives. Renvoie celles qui continuent.
+        """
+        cells = self.player_order[active, turn]
+        self.computer_shots_done[active, cells] = True
+        self.player_hits[active] += self.computer_ships[active, cells]
+        self.player_shots[active] += 1
+
+        won = self.player_hits[active] == self.ship_cells
+        self.winners[active[won]] = PLAYER
+        return active[~won]
+
+    def computer_step(self, active):
+        """
+        Tir de l'ordinateur dans toutes les parties actives. Renvoie celles qui continuent.
+        """
+        cells = self.random_cells(active)
+
+        if self.difficulty == "difficile":
+            chasing = np.flatnonzero(self.last_computer_hit[active] >= 0)
+            if chasing.size:
+                games = active[chasing]
+                candidates = self.neighbours[self.last_computer_hit[games]]
+                valid = candidates >= 0
+                valid &= ~self.player_shots_done[games[:, None], np.maximum(candidates, 0)]
+                keys = np.where(valid, self.rng.random(candidates.shape), -1.0)
+                choice = np.argmax(keys, axis=1)
+                found = valid.any(axis=1)
+                picked = candidates[np.arange(chasing.size), choice]
+                cells[chasing[found]] = picked[found]
+
+        self.player_shots_done[active, cells] = True
+        hit = self.player_ships[active, cells]
+        self.computer_hits[active] += hit
+        self.computer_shots[active] += 1
+        if self.difficulty == "difficile":
+            self.last_computer_hit[active] = np.where(hit, cells, -1)
+
+        won = self.computer_hits[active] == self.ship_cells
+        self.winners[active[won]] = COMPUTER
+        return active[~won]
+
+    def random_cells(self, active):
+        """
+        Prochaine case non visée de la permutation de chaque partie active.
+        """
+        position = self.computer_next[active]
+        cells = self.computer_order[active, position]
+        pending = np.flatnonzero(self.player_shots_done[active, cells])
+        while pending.size:
+            games = active[pending]
+            position[pending] += 1
+            cells[pending] = self.computer_order[games, position[pending]]
+            pending = pending[self.player_shots_done[games, cells[pending]]]
+        self.computer_next[active] = position
+        return cells
+
+    def summary(self):
+        """
+        Taux de victoire de l'ordinateur et distribution des tirs du vainqueur.
+        """
+        computer_won = self.winners == COMPUTER
+        winner_shots = np.where(computer_won, self.computer_shots, self.player_shots)
+        return {
+            "games": self.n_games,
+            "computer_win_rate": float(computer_won.mean()),
+            "mean_shots_to_win": float(winner_shots.mean()),
+            "shots_to_win_percentiles": {
+                p: int(np.percentile(winner_shots, p)) for p in (5, 25, 50, 75, 95)
+            },
+        }
+
+
+if __name__ == "__main__":
+    n_games = 100000
+    for difficulty in ["facile", "difficile"]:
+        start = time.perf_counter()
+        simulator = BatchSimulator(n_games, difficulty, seed=0).run()
+        duration = time.perf_counter() - start
+        stats = simulator.summary()
+        print(f"{difficulty} : l'ordinateur gagne {stats['computer_win_rate']:.1%} des parties, "
+              f"{stats['mean_shots_to_win']:.1f} tirs en moyenne pour gagner "
+              f"({n_games / duration:.0f} parties/s)")
@@ -0,0 +1,1121 @@
+"""
+Benchmarks du moteur sans interface.
+
+Usage : python benchmark.py [nom ...]   (sans argument : tous les benchmarks)
+"""
+import atexit
+import copy
+import os
+import random
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from ai import STRATEGIES, DensityStrategy
+from config import DEFAULT_CONFIG, GameConfig
+from board import ListBoard, BitBoard, SparseBoard, EMPTY, MISS, HIT, board_class_for
+from decision_cache import DecisionCache, cache_tag
+from engine import BatailleNavaleEngine, simulate_game
+from fleet import FLEET, Ship
+from opening_book import OpeningBook, build_book, write_book
+from placements import ORIENTATIONS, generate_fleets, place_fleet
+from symmetry import N_SYMMETRIES, CanonicalKnowledgeHash, get_symmetry
+from zobrist import KnowledgeHash, get_zobrist_keys
+
+
+def timed(func, *args):
+    """
+    Exécute func(*args) et renvoie la durée en secondes.
+    """
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def run_games(n_games, board_class, difficulty="difficile", config=DEFAULT_CONFIG):
+    for i in range(n_games):
+        simulate_game(difficulty, random.Random(i), board_class=board_class, config=config)
+
+
+def board_operations(board_class, n_rounds):
+    """
+    Durée moyenne (en µs) de chaque opération de plateau, sur un plateau
+    10x10 à moitié visé : {opération: durée}.
+    """
+    rng = random.Random(0)
+    board = board_class(10, FLEET)
+    board.place(4, 2, 5, "Horizontal")
+    board.place(0, 7, 4, "Vertical")
+    for _ in range(50):
+        board.shoot(rng.randrange(10), rng.randrange(10))
+    cells = [(rng.randrange(10), rng.randrange(10)) for _ in range(n_rounds)]
+    operations = {
+        "shoot": lambda: [board.shoot(row, col) for row, col in cells],
+        "get": lambda: [board.get(row, col) for row, col in cells],
+        "board[row][col]": lambda: [board[row][col] for row, col in cells],
+        "can_place": lambda: [board.can_place(row, col, 4, "Vertical") for row, col in cells],
+        "all_sunk": lambda: [board.all_sunk() for _ in cells],
+    }
+    return {name: timed(operation) / n_rounds * 1e6 for name, operation in operations.items()}
+
+
+def bench_boards(n_games=5000):
+    """
+    Grille liste de listes contre bitboard : chaque opération seule, puis
+    des parties complètes (où le plateau ne pèse qu'une petite part du
+    temps d'un tour), sur le plateau standard et sur des plateaux plus
+    grands à flotte proportionnelle.
+    """
+    print("Plateaux : opérations (µs)")
+    results = {board_class: board_operations(board_class, 100000) for board_class in [ListBoard, BitBoard]}
+    for name in results[ListBoard]:
+        print(f"  {name:16s} " + "  ".join(f"{board_class.__name__} {times[name]:5.2f}"
+                                           for board_class, times in results.items()))
+    for config, games in [(DEFAULT_CONFIG, n_games), (GameConfig.scaled(40), n_games // 100),
+                          (GameConfig.scaled(100), n_games // 1000)]:
+        print(f"Plateaux : {games} parties complètes, {config!r} "
+              f"(choix automatique : {board_class_for(config.board_size, config.fleet).__name__})")
+        reference = None
+        for board_class in [ListBoard, BitBoard]:
+            duration = timed(run_games, games, board_class, "difficile", config)
+            if reference is None:
+                reference = duration
+            print(f"  {board_class.__name__:10s} {duration:6.2f} s "
+                  f"({games / duration:8.0f} parties/s, x{reference / duration:.2f})")
+
+
+def check_all_placements(board_class, n_rounds):
+    board = board_class(10, FLEET)
+    board.place(4, 2, 5, "Horizontal")
+    board.place(0, 7, 4, "Vertical")
+    for _ in range(n_rounds):
+        for _, size in FLEET:
+            for orientation in ORIENTATIONS:
+                for row in range(10):
+                    for col in range(10):
+                        board.can_place(row, col, size, orientation)
+
+
+def bench_placement(n_rounds=500):
+    """
+    can_place sur tous les (taille, orientation, row, col) de la flotte.
+    """
+    print(f"Placement : {n_rounds} x {len(FLEET) * 200} tests can_place")
+    reference = None
+    for board_class in [ListBoard, BitBoard]:
+        duration = timed(check_all_placements, board_class, n_rounds)
+        if reference is None:
+            reference = duration
+        print(f"  {board_class.__name__:10s} {duration:6.2f} s (x{reference / duration:.2f})")
+
+
+def dict_fleet(engine):
+    """
+    Ancienne représentation : une liste de dicts par flotte.
+    """
+    return [{
+        'name': ship.name,
+        'size': ship.size,
+        'coordinates': ship.coordinates,
+        'hits': ship.hits,
+        'sunk': ship.sunk
+    } for ship in engine.computer_fleet]
+
+
+def measure_memory(build, n_items):
+    tracemalloc.start()
+    items = [build(i) for i in range(n_items)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return size / n_items
+
+
+def bench_fleet_memory(n_games=2000):
+    """
+    Mémoire par flotte terminée : liste de dicts contre Ship/Fleet slottés.
+    """
+    engines = [simulate_game("difficile", random.Random(i)) for i in range(n_games)]
+    print(f"Mémoire des flottes : {n_games} parties terminées")
+    as_dicts = measure_memory(lambda i: dict_fleet(engines[i]), n_games)
+    as_slots = measure_memory(lambda i: copy.deepcopy(engines[i].computer_fleet), n_games)
+    print(f"  dicts     {as_dicts:7.0f} octets/flotte")
+    print(f"  Fleet     {as_slots:7.0f} octets/flotte (x{as_dicts / as_slots:.2f})")
+
+
+def rejection_fleets(n_fleets, fleet, rng):
+    """
+    Ancien placement : on tire (orientation, row, col) jusqu'à ce que ça passe.
+    """
+    for _ in range(n_fleets):
+        board = BitBoard(10, fleet)
+        for _, size in fleet:
+            placed = False
+            while not placed:
+                orientation = rng.choice(ORIENTATIONS)
+                row = rng.randint(0, 9)
+                col = rng.randint(0, 9)
+                if board.can_place(row, col, size, orientation):
+                    board.place(row, col, size, orientation)
+                    placed = True
+
+
+def direct_fleets(n_fleets, fleet, rng, board_size=10):
+    for _ in generate_fleets(board_size, fleet, n_fleets, rng):
+        pass
+
+
+def bench_fleet_generation(n_fleets=20000):
+    """
+    Génération de flottes : rejet contre tirage direct avec backtracking.
+    """
+    print(f"Génération de flottes : {n_fleets} flottes")
+    rejection = timed(rejection_fleets, n_fleets, FLEET, random.Random(0))
+    direct = timed(direct_fleets, n_fleets, FLEET, random.Random(0))
+    print(f"  rejet         {rejection:6.2f} s")
+    print(f"  direct        {direct:6.2f} s (x{rejection / direct:.2f})")
+    dense = [("Porte-avions", 5)] * 14
+    duration = timed(direct_fleets, n_fleets // 10, dense, random.Random(0))
+    print(f"  direct dense  {duration:6.2f} s pour {n_fleets // 10} flottes de 14x5 cases "
+          "(le rejet peut ne jamais terminer)")
+    # Flotte presque pleine : les tirages uniformes s'enlisent, la
+    # recherche complète (search_fleet) prend le relais
+    packed = [("Porte-avions", 5)] * 174
+    duration = timed(direct_fleets, 10, packed, random.Random(0), 32)
+    print(f"  direct 85 %   {duration:6.2f} s pour 10 flottes de 174x5 cases sur 32x32")
+
+
+class RetryShotMixin:
+    """
+    Ancien random_shot : randint jusqu'à tomber sur une case libre.
+    """
+
+    def random_shot(self):
+        valid = False
+        row = col = 0
+        while not valid:
+            row = self.rng.randint(0, 9)
+            col = self.rng.randint(0, 9)
+            if (row, col) in self.targets:
+                valid = True
+        return (row, col)
+
+
+class RetryShotEngine(BatailleNavaleEngine):
+    def make_computer_ai(self):
+        base = STRATEGIES[self.difficulty]
+        retry_class = type("Retry" + base.__name__, (RetryShotMixin, base), {})
+        return retry_class(self.rng, 10, FLEET)
+
+
+def computer_only_games(engine_class, n_games, difficulty):
+    """
+    L'ordinateur tire seul jusqu'à couler toute la flotte du joueur.
+    """
+    for i in range(n_games):
+        engine = engine_class(difficulty=difficulty, rng=random.Random(i))
+        engine.place_ships_randomly(is_player=True)
+        engine.placing_phase = False
+        while not engine.game_over:
+            engine.computer_shoot_player()
+
+
+def bench_random_shot(n_games=5000):
+    """
+    Parties complètes de l'ordinateur : boucle randint contre CellPool.
+    """
+    print(f"random_shot : {n_games} parties de l'ordinateur seul")
+    for difficulty in ["facile", "difficile"]:
+        retry = timed(computer_only_games, RetryShotEngine, n_games, difficulty)
+        pool = timed(computer_only_games, BatailleNavaleEngine, n_games, difficulty)
+        print(f"  {difficulty:10s} boucle {retry:6.2f} s, CellPool {pool:6.2f} s (x{retry / pool:.2f})")
+
+
+def bench_batch(n_games=50000):
+    """
+    Simulateur NumPy en lot contre parties une à une (moteur).
+    """
+    from batch_sim import BatchSimulator  # NumPy n'est requis que pour ce benchmark
+
+    print(f"Simulation en lot : {n_games} parties")
+    for difficulty in ["facile", "difficile"]:
+        single = timed(run_games, n_games // 10, BitBoard, difficulty) * 10
+        batch = timed(lambda: BatchSimulator(n_games, difficulty, seed=0).run())
+        print(f"  {difficulty:10s} moteur {n_games / single:8.0f} parties/s, "
+              f"lot {n_games / batch:8.0f} parties/s (x{single / batch:.1f})")
+
+
+def bench_ai_latency(n_games=20):
+    """
+    Temps d'un coup de l'ordinateur (choix + tir) pour chaque stratégie (moyenne, 99e centile, max).
+    """
+    print(f"Latence par coup : {n_games} parties de l'ordinateur seul")
+    for name in STRATEGIES:
+        times = []
+        shots = 0
+        for i in range(n_games):
+            engine = BatailleNavaleEngine(difficulty=name, rng=random.Random(i))
+            engine.place_ships_randomly(is_player=True)
+            engine.placing_phase = False
+            while not engine.game_over:
+                start = time.perf_counter()
+                engine.computer_shoot_player()
+                times.append(time.perf_counter() - start)
+                shots += 1
+        times.sort()
+        print(f"  {name:10s} moyenne {sum(times) / len(times) * 1000:6.3f} ms, "
+              f"p99 {times[int(len(times) * 0.99)] * 1000:6.3f} ms, max {times[-1] * 1000:6.3f} ms, "
+              f"{shots / n_games:5.1f} tirs par partie")
+
+
+def hidden_fleet(board_size, fleet, rng):
+    """
+    Plateau + flotte placés au hasard, pour faire tirer une stratégie seule.
+    """
+    board = BitBoard(board_size, fleet)
+    ships = place_fleet(board, fleet, rng)
+    return board, ships
+
+
+def density_moves(board_size, fleet, n_moves, incremental):
+    """
+    Jusqu'à n_moves coups de la stratégie "expert" ; renvoie le temps moyen par coup.
+    """
+    rng = random.Random(0)
+    board, ships = hidden_fleet(board_size, fleet, rng)
+    strategy = DensityStrategy(rng, board_size, fleet, budget=float("inf"), incremental=incremental)
+    moves = 0
+    start = time.perf_counter()
+    while moves < n_moves and not ships.all_sunk():
+        row, col = strategy.choose()
+        result = board.shoot(row, col)
+        sunk = ships.hit(board.ship_at(row, col), row, col) if result == HIT else None
+        strategy.record(row, col, result, sunk)
+        moves += 1
+    return (time.perf_counter() - start) / moves
+
+
+def bench_density(n_moves=100):
+    """
+    Carte de densité : recalcul complet contre mise à jour incrémentale.
+    """
+    print(f"Carte de densité : {n_moves} coups de l'IA expert")
+    for board_size, copies in [(10, 1), (50, 25)]:
+        fleet = FLEET * copies
+        full = density_moves(board_size, fleet, n_moves, incremental=False)
+        incremental = density_moves(board_size, fleet, n_moves, incremental=True)
+        print(f"  {board_size}x{board_size} ({len(fleet)} navires) : recalcul {full * 1000:7.2f} ms/coup, "
+              f"incrémental {incremental * 1000:7.2f} ms/coup (x{full / incremental:.1f})")
+
+
+def endgame_games(n_games, endgame):
+    """
+    n_games parties de l'IA expert seule ; renvoie (tirs, pire temps d'un
+    coup de fin de partie, nombre de coups de fin de partie).
+    """
+    shots = 0
+    worst = 0.0
+    solved = 0
+    for i in range(n_games):
+        board, ships = hidden_fleet(10, FLEET, random.Random(i))
+        strategy = DensityStrategy(random.Random(i + 1), 10, FLEET, endgame=endgame)
+        while not ships.all_sunk():
+            start = time.perf_counter()
+            row, col = strategy.choose()
+            duration = time.perf_counter() - start
+            if endgame and strategy.endgame.ships is not None:
+                worst = max(worst, duration)
+                solved += 1
+            result = board.shoot(row, col)
+            sunk = ships.hit(board.ship_at(row, col), row, col) if result == HIT else None
+            strategy.record(row, col, result, sunk)
+            shots += 1
+    return shots, worst, solved
+
+
+def bench_endgame(n_games=1000):
+    """
+    IA expert avec et sans le solveur exact de fin de partie (mêmes parties).
+    """
+    print(f"Fin de partie : {n_games} parties de l'IA expert seule")
+    for endgame in (False, True):
+        start = time.perf_counter()
+        shots, worst, solved = endgame_games(n_games, endgame)
+        duration = time.perf_counter() - start
+        text = f"  {'avec' if endgame else 'sans'} solveur : {shots / n_games:6.3f} tirs par partie, {duration:5.2f} s"
+        if endgame:
+            text += f", {solved / n_games:.1f} coups de fin de partie par partie (pire {worst * 1000:.2f} ms)"
+        print(text)
+
+
+def knowledge_states(n_games, difficulty):
+    """
+    Après chaque tir de l'ordinateur : (hash de Zobrist incrémental, hash
+    recalculé depuis zéro, état exact connu du tireur).
+    """
+    keys = get_zobrist_keys(10, FLEET)
+    states = []
+    for i in range(n_games):
+        # Masques des ratés et des touchés lus directement sur le bitboard
+        engine = BatailleNavaleEngine(difficulty=difficulty, rng=random.Random(i), board_class=BitBoard)
+        engine.place_ships_randomly(is_player=True)
+        engine.placing_phase = False
+        board = engine.player_board
+        while not engine.game_over:
+            engine.computer_shoot_player()
+            sunk = [ship for ship in engine.player_fleet if ship.sunk]
+            scratch = 0
+            for cell in range(100):
+                if board.misses >> cell & 1:
+                    scratch ^= keys.shot_key(cell // 10, cell % 10, MISS)
+                elif board.hits >> cell & 1:
+                    scratch ^= keys.shot_key(cell // 10, cell % 10, HIT)
+            for ship in sunk:
+                scratch ^= keys.sunk_key(ship)
+            exact = (board.misses, board.hits,
+                     frozenset((ship.size, ship.orientation, ship.row, ship.col) for ship in sunk))
+            states.append((engine.computer_knowledge.value, scratch, exact))
+    return states
+
+
+def count_collisions(hashes, bits):
+    """
+    Nombre d'états distincts dont le hash, tronqué à bits bits, est déjà
+    pris par un autre état (hashes : {état: hash}).
+    """
+    mask = (1 << bits) - 1
+    seen = set()
+    collisions = 0
+    for value in hashes.values():
+        if value & mask in seen:
+            collisions += 1
+        seen.add(value & mask)
+    return collisions
+
+
+def recorded_moves(n_games):
+    """
+    Tirs (row, col, résultat, navire coulé ou None) de parties "difficile", à rejouer.
+    """
+    games = []
+    for i in range(n_games):
+        engine = BatailleNavaleEngine(difficulty="difficile", rng=random.Random(i))
+        engine.place_ships_randomly(is_player=True)
+        engine.placing_phase = False
+        moves = []
+        while not engine.game_over:
+            row, col, result = engine.computer_shoot_player()
+            sunk = None
+            if result == HIT:
+                ship = engine.player_fleet[engine.player_board.ship_at(row, col)]
+                sunk = ship if ship.sunk else None
+            moves.append((row, col, result, sunk))
+        games.append(moves)
+    return games
+
+
+def tuple_hashes(games):
+    """
+    Clé naïve : à chaque tir, hash du tuple de toutes les cases visibles
+    (navires intacts masqués) et des navires coulés.
+    """
+    for moves in games:
+        grid = [[EMPTY] * 10 for _ in range(10)]
+        sunk = []
+        for row, col, result, ship in moves:
+            grid[row][col] = result
+            if ship is not None:
+                sunk.append((ship.size, ship.orientation, ship.row, ship.col))
+            hash((tuple(value for line in grid for value in line), tuple(sunk)))
+
+
+def zobrist_hashes(games):
+    """
+    Clé de Zobrist : un XOR par tir, un de plus par navire coulé.
+    """
+    keys = get_zobrist_keys(10, FLEET)
+    for moves in games:
+        knowledge = KnowledgeHash(keys)
+        for row, col, result, ship in moves:
+            knowledge.shot(row, col, result)
+            if ship is not None:
+                knowledge.sink(ship)
+
+
+def bench_zobrist(n_games=2000):
+    """
+    Hash de Zobrist de la connaissance du tireur : collisions, et coût par
+    tir contre hash(tuple du plateau entier).
+    """
+    print(f"Zobrist : {n_games} parties de l'ordinateur seul")
+    for difficulty in ["facile", "difficile", "expert"]:
+        states = knowledge_states(n_games, difficulty)
+        mismatches = sum(value != scratch for value, scratch, _ in states)
+        hashes = {exact: value for value, _, exact in states}
+        k = len(hashes)
+        print(f"  {difficulty:10s} {len(states)} tirs, {k} états distincts, "
+              f"{mismatches} écarts incrémental/recalcul, {count_collisions(hashes, 64)} collisions sur 64 bits")
+        for bits in (32, 24):
+            # Paradoxe des anniversaires : environ k² / 2^(bits+1) collisions attendues
+            print(f"    tronqué à {bits} bits : {count_collisions(hashes, bits):5d} collisions "
+                  f"(attendu ~{k * k / 2 ** (bits + 1):.0f})")
+
+    games = recorded_moves(n_games)
+    n_moves = sum(len(moves) for moves in games)
+    naive = timed(tuple_hashes, games)
+    zobrist = timed(zobrist_hashes, games)
+    print(f"  coût par tir : tuple {naive / n_moves * 1e6:6.2f} µs, "
+          f"Zobrist {zobrist / n_moves * 1e6:6.3f} µs (x{naive / zobrist:.0f})")
+
+
+def cached_games(seeds, difficulty, caches):
+    """
+    Parties de l'ordinateur seul ; renvoie le temps moyen par coup.
+    """
+    moves = 0
+    start = time.perf_counter()
+    for i in seeds:
+        engine = BatailleNavaleEngine(difficulty=difficulty, rng=random.Random(i), decision_caches=caches)
+        engine.place_ships_randomly(is_player=True)
+        engine.placing_phase = False
+        while not engine.game_over:
+            engine.computer_shoot_player()
+            moves += 1
+    return (time.perf_counter() - start) / moves
+
+
+def bench_cache(n_games=500, n_montecarlo=20):
+    """
+    Cache LRU des décisions de l'IA : à froid, réchauffé par d'autres
+    parties, et avec une petite borne mémoire. Pour l'expert, dont le coup
+    coûte moins cher qu'une recherche dans le cache, et pour montecarlo
+    (seule stratégie mise en cache par défaut, ai.CACHED_STRATEGIES).
+    """
+    for name, count in [("expert", n_games), ("montecarlo", n_montecarlo)]:
+        print(f"Cache de décisions : {count} parties de l'IA {name} seule")
+        training = range(count, 2 * count)
+        games = range(count)
+        plain = cached_games(games, name, {})
+        print(f"  sans cache          {plain * 1000:7.3f} ms/coup")
+        for label, max_bytes, warm in [("à froid", 4 << 20, False), ("réchauffé", 4 << 20, True),
+                                       ("borné à 64 Kio", 64 << 10, True)]:
+            cache = DecisionCache(max_bytes, cache_tag(name, 10, FLEET))
+            if warm:
+                cached_games(training, name, {name: cache})
+                cache.hits = cache.misses = cache.evictions = 0
+            per_move = cached_games(games, name, {name: cache})
+            print(f"  {label:19s} {per_move * 1000:7.3f} ms/coup (x{plain / per_move:.2f}) : {cache.describe()}")
+
+
+def per_cell_canonical(n, misses, hits):
+    """
+    Représentant de l'orbite calculé case par case (référence lente).
+    """
+    best = None
+    for t in range(N_SYMMETRIES):
+        image = [0, 0]
+        for cell in range(n * n):
+            row, col = divmod(cell, n)
+            if t & 1:
+                col = n - 1 - col
+            if t & 2:
+                row = n - 1 - row
+            if t & 4:
+                row, col = col, row
+            for layer, mask in enumerate((misses, hits)):
+                if mask >> cell & 1:
+                    image[layer] |= 1 << (row * n + col)
+        image = (image[0], image[1], ())
+        if best is None or image < best[0]:
+            best = (image, t)
+    return best
+
+
+def replay_key(moves, t):
+    """
+    Clé canonique après avoir rejoué des tirs transformés par la symétrie t.
+    """
+    symmetry = get_symmetry(10)
+    knowledge = CanonicalKnowledgeHash(10, FLEET)
+    for row, col, result, ship in moves:
+        knowledge.shot(*divmod(symmetry.cell_maps[t][row * 10 + col], 10), result)
+        if ship is not None:
+            image = symmetry.transform(ship.mask(10), t)
+            origin = (image & -image).bit_length() - 1
+            horizontal = image >> (origin + 1) & 1
+            knowledge.sink(Ship(ship.name, ship.size, *divmod(origin, 10),
+                                ORIENTATIONS[0] if horizontal else ORIENTATIONS[1]))
+    return knowledge.canonical()[0]
+
+
+def bench_symmetry(n_games=500, n_montecarlo=20):
+    """
+    Canonicalisation par symétrie : invariance des clés, coût des
+    transformations par bandes, et taux de succès du cache de décisions
+    (expert, puis montecarlo).
+    """
+    print(f"Symétries du plateau : {n_games} parties de l'IA expert seule")
+    games = recorded_moves(50)
+    invariant = sum(len({replay_key(moves, t) for t in range(N_SYMMETRIES)}) == 1 for moves in games)
+    print(f"  clé identique pour les 8 images d'une partie : {invariant}/{len(games)}")
+
+    symmetry = get_symmetry(10)
+    rng = random.Random(0)
+    states = [(rng.getrandbits(100) & rng.getrandbits(100), rng.getrandbits(100) & rng.getrandbits(100) &
+               rng.getrandbits(100)) for _ in range(2000)]
+    agree = all(symmetry.canonical(misses, hits & ~misses) == per_cell_canonical(10, misses, hits & ~misses)
+                for misses, hits in states[:200])
+    bands = timed(lambda: [symmetry.canonical(misses, hits) for misses, hits in states])
+    cells = timed(lambda: [per_cell_canonical(10, misses, hits) for misses, hits in states[:200]]) * 10
+    print(f"  représentant d'orbite : par bandes {bands / len(states) * 1e6:6.1f} µs, "
+          f"case par case {cells / len(states) * 1e6:7.1f} µs (x{cells / bands:.0f}), "
+          f"{'identiques' if agree else 'DIFFÉRENTS'}")
+
+    # Sans cache, les égalités de la carte de densité sont tirées au hasard :
+    # des états symétriques apparaissent, qu'un cache ordinaire ne partage pas
+    raw = set()
+    canonical = set()
+    n_states = 0
+    for i in range(n_games):
+        engine = BatailleNavaleEngine(difficulty="expert", rng=random.Random(i))
+        engine.place_ships_randomly(is_player=True)
+        engine.placing_phase = False
+        for _ in range(15):
+            engine.computer_shoot_player()
+            knowledge = engine.computer_ai.knowledge
+            raw.add(knowledge.values[0])
+            canonical.add(knowledge.canonical()[0])
+            n_states += 1
+    print(f"  15 premiers coups sans cache : {n_states} états, {len(raw)} distincts, {len(canonical)} orbites "
+          f"(succès possibles {1 - len(raw) / n_states:.1%} -> {1 - len(canonical) / n_states:.1%})")
+
+    for symmetric in (False, True):
+        cache = DecisionCache(4 << 20, cache_tag("expert", 10, FLEET), symmetric)
+        per_move = cached_games(range(n_games), "expert", {"expert": cache})
+        print(f"  cache {'symétrique' if symmetric else 'ordinaire '} {per_move * 1000:6.3f} ms/coup : "
+              f"{cache.describe()}")
+
+    # montecarlo, seule stratégie mise en cache par défaut : cache réchauffé
+    # par d'autres parties, clés symétriques contre clés ordinaires
+    print(f"Symétries du plateau : {n_montecarlo} parties de l'IA montecarlo seule, cache réchauffé")
+    plain = cached_games(range(n_montecarlo), "montecarlo", {})
+    print(f"  sans cache           {plain * 1000:7.3f} ms/coup")
+    for symmetric in (False, True):
+        cache = DecisionCache(4 << 20, cache_tag("montecarlo", 10, FLEET), symmetric)
+        cached_games(range(n_montecarlo, 2 * n_montecarlo), "montecarlo", {"montecarlo": cache})
+        cache.hits = cache.misses = cache.evictions = 0
+        per_move = cached_games(range(n_montecarlo), "montecarlo", {"montecarlo": cache})
+        print(f"  cache {'symétrique' if symmetric else 'ordinaire '} {per_move * 1000:7.3f} ms/coup "
+              f"(x{plain / per_move:.2f}) : {cache.describe()}")
+
+
+def opening_moves(difficulty, seeds, depth, book):
+    """
+    depth premiers coups de l'ordinateur ; renvoie (temps moyen par coup,
+    part des coups trouvés dans le livre).
+    """
+    moves = 0
+    found = 0
+    elapsed = 0.0
+    for i in seeds:
+        engine = BatailleNavaleEngine(difficulty=difficulty, rng=random.Random(i), opening_book=book)
+        engine.place_ships_randomly(is_player=True)
+        engine.placing_phase = False
+        for _ in range(depth):
+            if book is not None and book.lookup(engine.computer_ai.knowledge.canonical()[0]) is not None:
+                found += 1
+            start = time.perf_counter()
+            engine.computer_shoot_player()
+            elapsed += time.perf_counter() - start
+            moves += 1
+    return elapsed / moves, found / moves
+
+
+def bench_book(n_games=200, n_book_games=20000, depth=15):
+    """
+    Livre d'ouvertures construit avec l'IA expert puis lu par mmap : coût
+    des premiers coups avec et sans livre.
+    """
+    import tempfile
+
+    print(f"Livre d'ouvertures : {n_book_games} parties explorées, {depth} coups")
+    start = time.perf_counter()
+    moves = build_book(n_book_games, depth, 2, 10, FLEET, seed=1)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "opening.book")
+        write_book(path, moves, depth, 10, FLEET)
+        print(f"  construction {time.perf_counter() - start:5.1f} s : {len(moves)} états, "
+              f"{os.path.getsize(path)} octets")
+        book = OpeningBook(path, 10, FLEET)
+        for difficulty, seeds in [("expert", range(n_games)), ("montecarlo", range(n_games // 50))]:
+            plain, _ = opening_moves(difficulty, seeds, depth, None)
+            booked, found = opening_moves(difficulty, seeds, depth, book)
+            print(f"  {difficulty:10s} sans livre {plain * 1000:8.3f} ms/coup, avec livre {booked * 1000:8.3f} ms/coup "
+                  f"({found:.0%} des {depth} premiers coups dans le livre)")
+        book.close()
+
+
+def scaled_engine(difficulty, config, seed=0, board_class=None):
+    engine = BatailleNavaleEngine(difficulty=difficulty, rng=random.Random(seed), board_class=board_class,
+                                  config=config)
+    engine.place_ships_randomly(is_player=True)
+    engine.placing_phase = False
+    engine.place_computer_ships_randomly()
+    return engine
+
+
+def bench_scaling(n_shots=1000):
+    """
+    Grands plateaux (flotte proportionnelle à la surface) : mise en place
+    d'une partie, mémoire du moteur et latence d'un tir de l'ordinateur.
+    """
+    print(f"Grands plateaux : mise en place, mémoire, {n_shots} tirs de l'ordinateur")
+    for board_size, difficulties in [(10, ["facile", "difficile", "expert"]),
+                                     (100, ["facile", "difficile", "expert"]),
+                                     (1000, ["facile", "difficile"])]:
+        config = GameConfig.scaled(board_size)
+        setup = timed(scaled_engine, "facile", config)
+        tracemalloc.start()
+        engine = scaled_engine("facile", config, seed=1)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del engine
+        print(f"  {config!r:32s} mise en place {setup * 1000:8.1f} ms, {memory / 2 ** 20:7.1f} Mio")
+        for difficulty in difficulties:
+            engine = scaled_engine(difficulty, config)
+            shots = 0
+            start = time.perf_counter()
+            while shots < n_shots and not engine.game_over:
+                engine.computer_shoot_player()
+                shots += 1
+            duration = time.perf_counter() - start
+            print(f"    {difficulty:10s} {duration / shots * 1e6:9.1f} µs/tir")
+
+
+def placed_board(board_class, config, rng):
+    board = board_class(config.board_size, config.fleet)
+    place_fleet(board, config.fleet, rng)
+    return board
+
+
+def bench_sparse(n_shots=20000):
+    """
+    Plateau creux contre grilles pleines : mémoire d'un plateau garni de sa
+    flotte, puis après n_shots tirs au hasard, et latence d'un tir.
+    """
+    print(f"Plateau creux : mémoire d'un plateau, {n_shots} tirs au hasard")
+    for config in [GameConfig(10), GameConfig(1000), GameConfig(1000, FLEET * 100),
+                   GameConfig.scaled(1000)]:
+        print(f"  {config!r:36s} (choix automatique : {board_class_for(config.board_size, config.fleet).__name__})")
+        n = config.board_size
+        rng = random.Random(0)
+        targets = [(rng.randrange(n), rng.randrange(n)) for _ in range(n_shots)]
+        for board_class in [ListBoard, BitBoard, SparseBoard]:
+            # Table de placement partagée construite hors mesure
+            placed_board(board_class, config, random.Random(0))
+            tracemalloc.start()
+            board = placed_board(board_class, config, random.Random(0))
+            placed = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            start = time.perf_counter()
+            for row, col in targets:
+                board.shoot(row, col)
+                board.all_sunk()
+            latency = (time.perf_counter() - start) / n_shots
+            tracemalloc.start()
+            board = placed_board(board_class, config, random.Random(0))
+            for row, col in targets:
+                board.shoot(row, col)
+            shot = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del board
+            print(f"    {board_class.__name__:12s} {placed / 1024:9.1f} Kio garni, {shot / 1024:9.1f} Kio après les tirs, "
+                  f"{latency * 1e6:7.2f} µs/tir")
+
+# Serveur X virtuel lancé pour les benchmarks d'affichage (None = pas lancé)
+_xvfb = None
+
+
+def start_xvfb():
+    """
+    Sans DISPLAY, lance Xvfb (s'il est installé) sur un écran libre et y
+    dirige tkinter ; le serveur est arrêté à la fin du processus.
+    """
+    global _xvfb
+    if _xvfb is not None or os.environ.get("DISPLAY") or shutil.which("Xvfb") is None:
+        return
+    number = 99
+    while os.path.exists(f"/tmp/.X11-unix/X{number}"):
+        number += 1
+    _xvfb = subprocess.Popen(["Xvfb", f":{number}", "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    atexit.register(_xvfb.terminate)
+    # Le serveur est prêt quand sa socket existe
+    for _ in range(50):
+        if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            break
+        time.sleep(0.1)
+    os.environ["DISPLAY"] = f":{number}"
+
+
+def open_display():
+    """
+    Fenêtre tkinter cachée pour les benchmarks d'affichage (sous Xvfb s'il
+    n'y a pas d'écran), ou None sans écran.
+    """
+    import tkinter as tk
+    start_xvfb()
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("  pas d'affichage disponible (DISPLAY, Xvfb), benchmark ignoré")
+        return None
+    root.withdraw()
+    return root
+
+
+def button_grid(parent, n):
+    """
+    Ancienne grille : un tk.Button et une lambda par case.
+    """
+    import tkinter as tk
+    frame = tk.Frame(parent)
+    for row in range(n):
+        for col in range(n):
+            tk.Button(frame, width=3, height=1, bg="#7EC8E3", text="", font=("Arial", 10),
+                      command=lambda r=row, c=col: None).grid(row=row, column=col, padx=1, pady=1)
+    return frame
+
+
+def bench_render(n_updates=2000):
+    """
+    Grille de boutons contre canevas : création de deux grilles (jusqu'au
+    premier affichage) et mise à jour de cases.
+    """
+    from board_view import BoardView, SpriteAtlas
+
+    print(f"Rendu des plateaux : création de deux grilles, {n_updates} cases mises à jour")
+    root = open_display()
+    if root is None:
+        return
+    rng = random.Random(0)
+    atlas = SpriteAtlas(root)
+    for n, renderers in [(10, ["boutons", "canevas"]), (30, ["boutons", "canevas"]), (1000, ["canevas"])]:
+        cells = [(rng.randrange(n), rng.randrange(n), rng.choice([MISS, HIT])) for _ in range(n_updates)]
+        for renderer in renderers:
+            start = time.perf_counter()
+            if renderer == "boutons":
+                grids = [button_grid(root, n) for _ in range(2)]
+            else:
+                grids = [BoardView(root, n, "#7EC8E3", lambda row, col: None, atlas) for _ in range(2)]
+            for grid in grids:
+                grid.pack()
+            root.update()
+            build = time.perf_counter() - start
+            update = ""
+            if renderer == "canevas":
+                start = time.perf_counter()
+                for row, col, value in cells:
+                    grids[0].set_cell(row, col, value)
+                root.update()
+                update = f", {(time.perf_counter() - start) / n_updates * 1e6:7.1f} µs/case"
+            print(f"  {n:4d}x{n:<4d} {renderer:8s} {build * 1000:9.1f} ms{update}")
+            for grid in grids:
+                grid.destroy()
+    root.destroy()
+
+
+def rebuild_game_frame(app):
+    """
+    Ancien chemin de "Lancer la partie" : détruire puis recréer tous les
+    widgets de la frameJeu.
+    """
+    # Les mises à jour en attente visent les widgets qui vont disparaître
+    app.flush_updates()
+    for child in app.frameJeu.winfo_children():
+        child.destroy()
+    app.create_frame_jeu_content()
+    app.on_start_game_clicked()
+
+
+def bench_replay(n_games=50):
+    """
+    Temps entre "Lancer la partie" et une grille prête à jouer :
+    widgets détruits et recréés contre widgets conservés.
+    """
+    print(f"Rejouer : {n_games} nouvelles parties après une partie jouée")
+    root = open_display()
+    if root is None:
+        return
+    root.destroy()
+    from main_fin import BatailleNavaleApp
+
+    for label, start_game in [("reconstruction", rebuild_game_frame),
+                              ("réutilisation", BatailleNavaleApp.on_start_game_clicked)]:
+        app = BatailleNavaleApp()
+        app.withdraw()
+        total = 0.0
+        for _ in range(n_games):
+            # Une partie jouée au hasard, pour que les grilles aient des cases à effacer
+            app.on_start_game_clicked()
+            app.engine.place_ships_randomly(is_player=True)
+            app.engine.placing_phase = False
+            app.engine.place_computer_ships_randomly()
+            while not app.engine.game_over:
+                app.engine.computer_shoot_player()
+            app.update()
+            start = time.perf_counter()
+            start_game(app)
+            app.update()
+            total += time.perf_counter() - start
+        app.destroy()
+        print(f"  {label:15s} {total / n_games * 1000:8.2f} ms/partie")
+
+
+def bench_ui_updates(n_games=20):
+    """
+    Appels configure par tour de jeu, comptés sur l'application elle-même :
+    chaque mise à jour appliquée dès qu'elle est demandée, labels compris
+    (chemin d'avant le regroupement), contre une application par image.
+    Le placement et l'effacement des grilles entre deux parties ne sont
+    pas comptés.
+    """
+    print(f"Mises à jour de l'affichage : {n_games} parties ordinateur contre ordinateur")
+    root = open_display()
+    if root is None:
+        return
+    root.destroy()
+    from main_fin import BatailleNavaleApp
+
+    class ImmediateApp(BatailleNavaleApp):
+        def schedule_flush(self):
+            # Sans regroupement ni comparaison au texte affiché
+            self.shown_texts.clear()
+            self.flush_updates()
+
+    for label, app_class in [("immédiat", ImmediateApp), ("par image", BatailleNavaleApp)]:
+        app = app_class()
+        app.withdraw()
+        turns = 0
+        calls = 0
+        for i in range(n_games):
+            app.engine.rng = random.Random(i)
+            app.on_start_game_clicked()
+            app.engine.place_ships_randomly(is_player=True)
+            app.engine.placing_phase = False
+            app.engine.place_computer_ships_randomly()
+            app.flush_updates()
+            before = app.count_configure_calls()
+            n = app.engine.config.board_size
+            targets = [(row, col) for row in range(n) for col in range(n)]
+            app.engine.rng.shuffle(targets)
+            while not app.engine.game_over:
+                app.player_shoot_computer(*targets.pop())
+                if not app.engine.game_over:
+                    app.computer_shoot_player()
+                # Une image par tour : le tir différé de l'ordinateur est
+                # annulé (il vient d'être joué) et les mises à jour appliquées
+                for after_id in app.tk.splitlist(app.tk.call("after", "info")):
+                    app.after_cancel(after_id)
+                app.flush_updates()
+                app.update_idletasks()
+                turns += 1
+            calls += app.count_configure_calls() - before
+        print(f"  {label:10s} {calls / turns:6.1f} appels configure par tour")
+        app.destroy()
+
+
+def sunk_label_texts(engine, events, rescan):
+    """
+    Textes des labels "Bateaux coulés" le long d'une partie rejouée :
+    recalculés des deux flottes à chaque touche (rescan) ou, pour le seul
+    camp concerné, à chaque navire coulé.
+    """
+    for is_player, sunk_count in events:
+        if rescan:
+            for fleet in (engine.player_fleet, engine.computer_fleet):
+                names = [ship.name for ship in fleet if ship.sunk]
+                ", ".join(names) if names else "(aucun)"
+        elif sunk_count:
+            names = (engine.player_sunk if is_player else engine.computer_sunk)[:sunk_count]
+            ", ".join(names)
+
+
+def bench_sunk_labels():
+    """
+    Labels des navires coulés : rescan des flottes à chaque touche contre
+    listes tenues par le moteur, lues seulement quand un navire coule.
+    """
+    print("Labels des navires coulés : une partie complète")
+    for config in [GameConfig(10), GameConfig.scaled(30), GameConfig.scaled(100)]:
+        # (camp touché, navires coulés de ce camp si la touche en coule un, sinon 0)
+        events = []
+        counts = {True: 0, False: 0}
+
+        def on_changes(changes):
+            for is_player, _ in changes.sunk:
+                counts[is_player] += 1
+            for (is_player, _, _), value in changes.cells.items():
+                if value == HIT:
+                    sunk = any(side == is_player for side, _ in changes.sunk)
+                    events.append((is_player, counts[is_player] if sunk else 0))
+
+        engine = BatailleNavaleEngine("difficile", random.Random(0), on_changes=on_changes, config=config)
+        engine.place_ships_randomly(is_player=True)
+        engine.placing_phase = False
+        engine.place_computer_ships_randomly()
+        n = config.board_size
+        targets = [(r, c) for r in range(n) for c in range(n)]
+        engine.rng.shuffle(targets)
+        while not engine.game_over:
+            engine.player_shoot_computer(*targets.pop())
+            if not engine.game_over:
+                engine.computer_shoot_player()
+
+        rescan = timed(sunk_label_texts, engine, events, True)
+        incremental = timed(sunk_label_texts, engine, events, False)
+        print(f"  {config!r:36s} {len(events):6d} touches : rescan {rescan * 1000:8.2f} ms, "
+              f"listes {incremental * 1000:7.2f} ms (x{rescan / incremental:.0f})")
+
+
+def styled_cells(canvas, n, cell):
+    """
+    Rendu précédent : un rectangle et un texte par case, couleurs et
+    lettre passées en options à chaque mise à jour.
+    """
+    items = []
+    for row in range(n):
+        for col in range(n):
+            x, y = col * cell, row * cell
+            items.append((canvas.create_rectangle(x + 1, y + 1, x + cell - 1, y + cell - 1, width=0),
+                          canvas.create_text(x + cell / 2, y + cell / 2, text="", font=("Arial", 10, "bold"))))
+    return items
+
+
+def bench_reveal(n_rounds=5):
+    """
+    Révélation d'un plateau entier (toutes les cases touchées puis
+    coulées, jusqu'à l'affichage) : options couleur/texte contre sprites.
+    """
+    import tkinter as tk
+
+    from board_view import BoardView, SpriteAtlas, SUNK, STYLES
+
+    print(f"Révélation d'un plateau entier : {n_rounds} passes touché puis coulé")
+    root = open_display()
+    if root is None:
+        return
+    atlas = SpriteAtlas(root)
+    start = time.perf_counter()
+    atlas.tiles(28, "#7EC8E3", True)
+    print(f"  création des sprites {(time.perf_counter() - start) * 1000:.1f} ms")
+    for n in (10, 30):
+        view = BoardView(root, n, "#7EC8E3", lambda row, col: None, atlas)
+        view.pack()
+        canvas = tk.Canvas(root, width=view.cell * n, height=view.cell * n)
+        canvas.pack()
+        items = styled_cells(canvas, n, view.cell)
+        # Éléments des sprites créés hors mesure, comme ceux du rendu précédent
+        for row in range(n):
+            for col in range(n):
+                view.set_cell(row, col, MISS)
+        root.update()
+
+        start = time.perf_counter()
+        for _ in range(n_rounds):
+            for state in (HIT, SUNK):
+                fill, _, color = STYLES[state]
+                fill = fill or "#7EC8E3"
+                for rectangle, text in items:
+                    canvas.itemconfigure(rectangle, fill=fill)
+                    canvas.itemconfigure(text, text="X", fill=color)
+                root.update()
+        styled = (time.perf_counter() - start) / (2 * n_rounds)
+
+        start = time.perf_counter()
+        for _ in range(n_rounds):
+            for state in (HIT, SUNK):
+                for row in range(n):
+                    for col in range(n):
+                        view.set_cell(row, col, state)
+                root.update()
+        sprites = (time.perf_counter() - start) / (2 * n_rounds)
+        print(f"  {n:4d}x{n:<4d} options {styled * 1000:8.2f} ms, sprites {sprites * 1000:8.2f} ms "
+              f"(x{styled / sprites:.1f})")
+        view.destroy()
+        canvas.destroy()
+    root.destroy()
+
+
+def bench_viewport(n_frames=200, board_size=1000, shot_rate=0.3):
+    """
+    Plateau virtualisé : défilement en diagonale d'un plateau dont une
+    partie des cases a été visée, une image (rendu + affichage) par pas.
+    """
+    from board_view import BoardView, SpriteAtlas, SUNK
+
+    print(f"Vue virtualisée {board_size}x{board_size} : {n_frames} images de défilement, "
+          f"{shot_rate:.0%} des cases visées")
+    root = open_display()
+    if root is None:
+        return
+    rng = random.Random(0)
+    view = BoardView(root, board_size, "#7EC8E3", lambda row, col: None, SpriteAtlas(root))
+    view.pack()
+    root.update()
+    start = time.perf_counter()
+    for cell in rng.sample(range(board_size * board_size), int(shot_rate * board_size * board_size)):
+        view.set_cell(*divmod(cell, board_size), rng.choice([MISS, HIT, SUNK]))
+    fill = time.perf_counter() - start
+    print(f"  {len(view.states)} cases marquées en {fill:.2f} s "
+          f"({fill / len(view.states) * 1e6:.2f} µs/case, minicarte comprise)")
+    for cell_size in (10, 4, 30):
+        while view.cell != cell_size:
+            view.zoom(1 if view.cell < cell_size else -1)
+        durations = []
+        for frame in range(n_frames):
+            start = time.perf_counter()
+            view.scroll_x("scroll", 1, "units")
+            view.scroll_y("scroll", 1, "units")
+            view.render()
+            root.update()
+            durations.append(time.perf_counter() - start)
+        durations.sort()
+        mean = sum(durations) / n_frames
+        print(f"  cases de {cell_size:2d} px : {mean * 1000:6.2f} ms/image en moyenne "
+              f"({1 / mean:5.0f} images/s), 95e centile {durations[int(0.95 * n_frames)] * 1000:6.2f} ms, "
+              f"{len(view.canvas.find_all())} éléments sur le canevas")
+    root.destroy()
+
+
+BENCHMARKS = {
+    "boards": bench_boards,
+    "placement": bench_placement,
+    "fleet_memory": bench_fleet_memory,
+    "fleet_generation": bench_fleet_generation,
+    "random_shot": bench_random_shot,
+    "batch": bench_batch,
+    "ai_latency": bench_ai_latency,
+    "density": bench_density,
+    "endgame": bench_endgame,
+    "zobrist": bench_zobrist,
+    "cache": bench_cache,
+    "symmetry": bench_symmetry,
+    "book": bench_book,
+    "scaling": bench_scaling,
+    "sparse": bench_sparse,
+    "render": bench_render,
+    "replay": bench_replay,
+    "ui_updates": bench_ui_updates,
+    "sunk_labels": bench_sunk_labels,
+    "reveal": bench_reveal,
+    "viewport": bench_viewport,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
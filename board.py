@@ -0,0 +1,273 @@
+from array import array
+
+from placements import get_placement_table
+
+# Codes des cases : 0=vide, 1=navire, 2=raté, 3=touché
+EMPTY = 0
+SHIP = 1
+MISS = 2
+HIT = 3
+
+
+class ListBoard:
+    """
+    Plateau historique : une grille (liste de listes) de codes 0/1/2/3.
+    Représentation par défaut : un tir y coûte un accès de liste.
+    """
+
+    def __init__(self, size=10, fleet=None):
+        self.size = size
+        self.grid = [[EMPTY]*size for _ in range(size)]
+        # Index case -> navire (numéro + 1, 0 = pas de navire)
+        self.ship_ids = array('I', bytes(4 * size * size))
+
+    def __getitem__(self, row):
+        return self.grid[row]
+
+    def get(self, row, col):
+        return self.grid[row][col]
+
+    def ship_at(self, row, col):
+        """
+        Numéro du navire occupant la case, ou None.
+        """
+        ship_id = self.ship_ids[row * self.size + col]
+        return ship_id - 1 if ship_id else None
+
+    def can_place(self, row, col, size, orientation):
+        if orientation == "Horizontal":
+            if col + size > self.size:
+                return False
+            for c in range(col, col + size):
+                if self.grid[row][c] != EMPTY:
+                    return False
+        else:  # Vertical
+            if row + size > self.size:
+                return False
+            for r in range(row, row + size):
+                if self.grid[r][col] != EMPTY:
+                    return False
+        return True
+
+    def place(self, row, col, size, orientation, ship_id=0):
+        coords = []
+        if orientation == "Horizontal":
+            for c in range(col, col + size):
+                self.grid[row][c] = SHIP
+                self.ship_ids[row * self.size + c] = ship_id + 1
+                coords.append((row, c))
+        else:
+            for r in range(row, row + size):
+                self.grid[r][col] = SHIP
+                self.ship_ids[r * self.size + col] = ship_id + 1
+                coords.append((r, col))
+        return coords
+
+    def shoot(self, row, col):
+        """
+        Tire sur une case. Renvoie HIT, MISS, ou None si déjà visée.
+        """
+        value = self.grid[row][col]
+        if value in [MISS, HIT]:
+            return None
+        if value == SHIP:
+            self.grid[row][col] = HIT
+            return HIT
+        self.grid[row][col] = MISS
+        return MISS
+
+    def all_sunk(self):
+        for row in self.grid:
+            if SHIP in row:
+                return False
+        return True
+
+
+class BitBoard:
+    """
+    Plateau en bitboard : un entier Python par couche (navires, ratés,
+    touchés), la case (row, col) correspondant au bit row * size + col.
+    Les tests de placement, de tir et "tout coulé" sont des opérations
+    de masques.
+    """
+
+    def __init__(self, size=10, fleet=None):
+        self.size = size
+        # Table des masques de placement, partagée entre plateaux de même taille
+        self.table = get_placement_table(size, fleet)
+        self.ships = 0
+        self.misses = 0
+        self.hits = 0
+        # Index case -> navire (numéro + 1, 0 = pas de navire)
+        self.ship_ids = array('I', bytes(4 * size * size))
+
+    def __getitem__(self, row):
+        """
+        Accès compatible avec l'ancienne grille : board[row][col] renvoie
+        le code 0/1/2/3 de la case (lecture seule). Construit toute la
+        ligne : hors des chemins critiques, où l'on utilise get().
+        """
+        n = self.size
+        full = (1 << n) - 1
+        shift = row * n
+        ships = self.ships >> shift & full
+        misses = self.misses >> shift & full
+        hits = self.hits >> shift & full
+        return [HIT if hits >> col & 1 else MISS if misses >> col & 1 else SHIP if ships >> col & 1 else EMPTY
+                for col in range(n)]
+
+    def get(self, row, col):
+        bit = 1 << (row * self.size + col)
+        if self.hits & bit:
+            return HIT
+        if self.misses & bit:
+            return MISS
+        if self.ships & bit:
+            return SHIP
+        return EMPTY
+
+    def ship_at(self, row, col):
+        """
+        Numéro du navire occupant la case, ou None.
+        """
+        ship_id = self.ship_ids[row * self.size + col]
+        return ship_id - 1 if ship_id else None
+
+    def placement_mask(self, row, col, size, orientation):
+        """
+        Masque des cases couvertes par un navire, ou 0 s'il sort du plateau.
+        """
+        return self.table.mask(size, orientation, row, col)
+
+    def can_place(self, row, col, size, orientation):
+        mask = self.table.mask(size, orientation, row, col)
+        return mask != 0 and not (mask & self.ships)
+
+    def place(self, row, col, size, orientation, ship_id=0):
+        self.ships |= self.placement_mask(row, col, size, orientation)
+        if orientation == "Horizontal":
+            coords = [(row, c) for c in range(col, col + size)]
+        else:
+            coords = [(r, col) for r in range(row, row + size)]
+        for (r, c) in coords:
+            self.ship_ids[r * self.size + c] = ship_id + 1
+        return coords
+
+    def shoot(self, row, col):
+        """
+        Tire sur une case. Renvoie HIT, MISS, ou None si déjà visée.
+        """
+        bit = 1 << (row * self.size + col)
+        if (self.hits | self.misses) & bit:
+            return None
+        if self.ships & bit:
+            self.hits |= bit
+            return HIT
+        self.misses |= bit
+        return MISS
+
+    def all_sunk(self):
+        return not (self.ships & ~self.hits)
+
+
+class SparseBoard:
+    """
+    Plateau creux pour les très grandes grilles presque vides : seules les
+    cases de navire (dict case -> numéro + 1) et les cases visées (dict
+    case -> MISS/HIT) sont stockées, la case (row, col) ayant pour clé
+    row * size + col. Même interface que BitBoard ; chaque opération ne
+    touche que les cases concernées, quelle que soit la taille du plateau.
+    """
+
+    def __init__(self, size=10, fleet=None):
+        self.size = size
+        self.ship_cells = {}
+        self.shots = {}
+        # Cases de navire pas encore touchées : "tout coulé" en O(1)
+        self.intact = 0
+
+    def __getitem__(self, row):
+        """
+        Accès compatible avec l'ancienne grille : board[row][col] renvoie
+        le code 0/1/2/3 de la case (lecture seule).
+        """
+        return [self.get(row, col) for col in range(self.size)]
+
+    def get(self, row, col):
+        cell = row * self.size + col
+        value = self.shots.get(cell)
+        if value is not None:
+            return value
+        return SHIP if cell in self.ship_cells else EMPTY
+
+    def ship_at(self, row, col):
+        """
+        Numéro du navire occupant la case, ou None.
+        """
+        ship_id = self.ship_cells.get(row * self.size + col)
+        return ship_id - 1 if ship_id else None
+
+    def placement_cells(self, row, col, size, orientation):
+        """
+        Indices des cases couvertes par un navire, ou None s'il sort du plateau.
+        """
+        n = self.size
+        if orientation == "Horizontal":
+            if col + size > n:
+                return None
+            return range(row * n + col, row * n + col + size)
+        if row + size > n:
+            return None
+        return range(row * n + col, (row + size) * n + col, n)
+
+    def can_place(self, row, col, size, orientation):
+        cells = self.placement_cells(row, col, size, orientation)
+        if cells is None:
+            return False
+        ship_cells = self.ship_cells
+        return not any(cell in ship_cells for cell in cells)
+
+    def place(self, row, col, size, orientation, ship_id=0):
+        cells = self.placement_cells(row, col, size, orientation)
+        for cell in cells:
+            self.ship_cells[cell] = ship_id + 1
+        self.intact += size
+        return [divmod(cell, self.size) for cell in cells]
+
+    def shoot(self, row, col):
+        """
+        Tire sur une case. Renvoie HIT, MISS, ou None si déjà visée.
+        """
+        cell = row * self.size + col
+        if cell in self.shots:
+            return None
+        if cell in self.ship_cells:
+            self.shots[cell] = HIT
+            self.intact -= 1
+            return HIT
+        self.shots[cell] = MISS
+        return MISS
+
+    def all_sunk(self):
+        return self.intact == 0
+
+
+# Choix automatique : plateau creux au-delà de SPARSE_MIN_CELLS cases si
+# les navires en couvrent au plus SPARSE_DENSITY (une entrée de dict coûte
+# ~100 octets, contre ~12 octets par case pour ListBoard et son index)
+SPARSE_MIN_CELLS = 64 * 64
+SPARSE_DENSITY = 0.02
+
+
+def board_class_for(size, fleet):
+    """
+    Représentation adaptée à un plateau size x size et à sa flotte :
+    SparseBoard si le plateau est grand et presque vide, sinon ListBoard.
+    BitBoard, plus rapide pour "tout coulé" mais plus lent pour un tir,
+    ne gagne pas de partie complète (benchmark.py boards).
+    """
+    n_cells = size * size
+    ship_cells = sum(ship_size for _, ship_size in fleet)
+    if n_cells >= SPARSE_MIN_CELLS and ship_cells <= SPARSE_DENSITY * n_cells:
+        return SparseBoard
+    return ListBoard
@@ -0,0 +1,401 @@
+"""
+Rendu d'un plateau sur un seul tk.Canvas.
+
+Remplace la grille de tk.Button (un widget et une lambda par case) : le
+fond et le quadrillage sont dessinés une fois, une case ne reçoit son
+élément de canevas que lorsqu'elle cesse d'être vide, et seules les
+cases dont l'aspect change sont redessinées. Un clic est ramené à sa
+case par une division entière.
+
+Un plateau trop grand pour la place disponible est virtualisé : le
+canevas défile (barres, molette) et se zoome (Ctrl + molette), et seules
+les cases de la partie visible, plus une marge, ont un élément ; l'état
+de toutes les cases reste dans un dict. Une minicarte montre le plateau
+entier en image sous-échantillonnée, avec le cadre de la partie visible.
+
+L'aspect de chaque état de case (eau, navire, raté, touché, coulé) est
+une image tk.PhotoImage dessinée une fois pour toutes (SpriteAtlas) :
+changer l'état d'une case ne fait que changer l'image de son élément,
+sans couleurs ni texte à interpréter par Tk.
+"""
+import tkinter as tk
+
+from board import SHIP, MISS, HIT
+
+# Place disponible pour une grille dans la fenêtre, en pixels
+GRID_PIXELS = 330
+# Taille maximale d'une case (plateau 10x10 : cases de 30 pixels)
+MAX_CELL = 30
+# En dessous, pas de quadrillage ni de symboles : la case est un aplat
+MIN_DETAILED_CELL = 8
+# Plateau virtualisé : taille des cases à l'ouverture, niveaux de zoom,
+# et cases dessinées au-delà du bord visible (défilement sans trou)
+VIEW_CELL = 10
+ZOOM_LEVELS = (4, 6, 8, 10, 15, 20, 30)
+RENDER_MARGIN = 4
+# Côté maximal de la minicarte, en pixels (une case de minicarte résume
+# un bloc de cases du plateau)
+MINIMAP_PIXELS = 100
+
+GRID_COLOR = "#88CCFF"
+SHIP_COLOR = "#0033CC"
+SUNK_COLOR = "#696969"
+VIEWPORT_COLOR = "#FFFF00"
+
+# État affiché d'une case -> (fond, symbole, couleur du symbole) ;
+# fond None = couleur de l'eau du plateau. Une touche sur un navire
+# visible (grille du joueur) garde le fond du navire : SHIP_HIT
+WATER = None
+SUNK = "sunk"
+SHIP_HIT = "ship_hit"
+STYLES = {
+    WATER: (None, None, None),
+    SHIP: (SHIP_COLOR, None, None),
+    MISS: (None, "O", "#0000FF"),
+    HIT: (None, "X", "#FF0000"),
+    SHIP_HIT: (SHIP_COLOR, "X", "#FF0000"),
+    SUNK: (SUNK_COLOR, "X", "#FFFFFF"),
+}
+
+# Minicarte : couleur et priorité de chaque état (un bloc prend la
+# couleur de sa case la plus importante)
+MINIMAP_STYLES = {
+    MISS: ("#0000FF", 1),
+    SHIP: (SHIP_COLOR, 2),
+    HIT: ("#FF0000", 3),
+    SHIP_HIT: ("#FF0000", 3),
+    SUNK: (SUNK_COLOR, 4),
+}
+
+
+def symbol_pixels(symbol, size):
+    """
+    Pixels (x, y) allumés du symbole "X" ou "O" dans un carré size x size.
+    """
+    margin = size // 4
+    thickness = max(1, size // 12)
+    low, high = margin, size - 1 - margin
+    center = (size - 1) / 2
+    radius = (high - low) / 2
+    pixels = set()
+    for y in range(low, high + 1):
+        for x in range(low, high + 1):
+            if symbol == "X":
+                on = abs(x - y) <= thickness or abs(x + y - (size - 1)) <= thickness
+            else:
+                distance = ((x - center) ** 2 + (y - center) ** 2) ** 0.5
+                on = radius - 2 * thickness < distance <= radius + 0.5
+            if on:
+                pixels.add((x, y))
+    return pixels
+
+
+class SpriteAtlas:
+    """
+    Images des états de case, créées une seule fois par taille de case et
+    couleur d'eau, et partagées par toutes les grilles de l'application.
+    """
+
+    def __init__(self, master):
+        self.master = master
+        # (taille, eau, symboles dessinés) -> {état: tk.PhotoImage}
+        self.sprites = {}
+
+    def tiles(self, size, water_color, detailed):
+        key = (size, water_color, detailed)
+        if key not in self.sprites:
+            self.sprites[key] = {state: self.render(size, water_color, state, detailed)
+                                 for state in STYLES}
+        return self.sprites[key]
+
+    def render(self, size, water_color, state, detailed):
+        fill, symbol, symbol_color = STYLES[state]
+        if fill is None:
+            fill = water_color
+            if symbol is not None and not detailed:
+                # Case trop petite pour un symbole : aplat de sa couleur
+                fill = symbol_color
+        image = tk.PhotoImage(master=self.master, width=size, height=size)
+        if symbol is None or not detailed:
+            image.put(fill, to=(0, 0, size, size))
+            return image
+        pixels = symbol_pixels(symbol, size)
+        rows = []
+        for y in range(size):
+            colors = [symbol_color if (x, y) in pixels else fill for x in range(size)]
+            rows.append("{" + " ".join(colors) + "}")
+        image.put(" ".join(rows))
+        return image
+
+
+class BoardView(tk.Frame):
+    """
+    Grille board_size x board_size dessinée sur un canevas avec les images
+    de atlas. on_click(row, col) est appelé quand on clique sur une case.
+    """
+
+    def __init__(self, parent, board_size, water_color, on_click, atlas):
+        super().__init__(parent, bg=GRID_COLOR)
+        self.board_size = board_size
+        self.water_color = water_color
+        self.on_click = on_click
+        self.atlas = atlas
+        fit = GRID_PIXELS // board_size
+        # Plateau plus grand que la place disponible : défilement et minicarte
+        self.virtual = fit < VIEW_CELL
+        self.cell = VIEW_CELL if self.virtual else min(MAX_CELL, fit)
+        pixels = min(GRID_PIXELS, self.cell * board_size)
+        self.canvas = tk.Canvas(self, width=pixels, height=pixels, bg=GRID_COLOR,
+                                highlightthickness=0, borderwidth=0)
+        self.canvas.grid(row=0, column=0)
+        # Case (row * n + col) -> image du canevas, pour les seules cases
+        # de la fenêtre dessinée
+        self.items = {}
+        # Case -> état affiché (SHIP, MISS, HIT, SHIP_HIT ou SUNK) ; absente = eau
+        self.states = {}
+        # Fenêtre dessinée (row0, row1, col0, col1), None = à recalculer
+        self.window = None
+        self.render_id = None
+        # Appels itemconfigure faits (mesure du coût des mises à jour)
+        self.configure_calls = 0
+        self.canvas.bind("<Button-1>", self.on_button)
+        if self.virtual:
+            self.create_scrolling()
+            self.create_minimap()
+        self.draw_background()
+        self.render()
+
+    # -----------------------------------------------------------------
+    # Fond, défilement, zoom
+    # -----------------------------------------------------------------
+    def draw_background(self):
+        """
+        Fond et quadrillage du plateau entier au zoom courant ; les cases
+        déjà dessinées sont effacées (elles le seront à nouveau par render).
+        """
+        canvas = self.canvas
+        canvas.delete("all")
+        self.items.clear()
+        self.window = None
+        self.detailed = self.cell >= MIN_DETAILED_CELL
+        # Une case détaillée laisse un pixel de quadrillage de chaque côté
+        self.inset = 1 if self.detailed else 0
+        self.tiles = self.atlas.tiles(self.cell - 2 * self.inset, self.water_color, self.detailed)
+        pixels = self.cell * self.board_size
+        canvas.configure(scrollregion=(0, 0, pixels, pixels))
+        canvas.create_rectangle(0, 0, pixels, pixels, fill=self.water_color, width=0)
+        if self.detailed:
+            for k in range(self.board_size + 1):
+                offset = k * self.cell
+                canvas.create_line(offset, 0, offset, pixels, fill=GRID_COLOR, width=2)
+                canvas.create_line(0, offset, pixels, offset, fill=GRID_COLOR, width=2)
+
+    def create_scrolling(self):
+        canvas = self.canvas
+        x_bar = tk.Scrollbar(self, orient="horizontal", command=self.scroll_x)
+        y_bar = tk.Scrollbar(self, orient="vertical", command=self.scroll_y)
+        x_bar.grid(row=1, column=0, sticky="ew")
+        y_bar.grid(row=0, column=1, sticky="ns")
+        canvas.configure(xscrollcommand=x_bar.set, yscrollcommand=y_bar.set)
+        # Molette : défilement vertical, Maj + molette : horizontal,
+        # Ctrl + molette : zoom (Button-4/5 sous X11)
+        canvas.bind("<MouseWheel>", lambda event: self.on_wheel(event, -1 if event.delta > 0 else 1))
+        canvas.bind("<Button-4>", lambda event: self.on_wheel(event, -1))
+        canvas.bind("<Button-5>", lambda event: self.on_wheel(event, 1))
+
+    def scroll_x(self, *args):
+        self.canvas.xview(*args)
+        self.schedule_render()
+
+    def scroll_y(self, *args):
+        self.canvas.yview(*args)
+        self.schedule_render()
+
+    def on_wheel(self, event, step):
+        if event.state & 0x4:
+            self.zoom(-step)
+        elif event.state & 0x1:
+            self.scroll_x("scroll", step * 3, "units")
+        else:
+            self.scroll_y("scroll", step * 3, "units")
+
+    def center_on(self, row, col):
+        """
+        Fait défiler la vue pour centrer la case (row, col).
+        """
+        pixels = self.cell * self.board_size
+        half = int(self.canvas.cget("width")) / 2
+        self.canvas.xview_moveto(max(0, (col + 0.5) * self.cell - half) / pixels)
+        self.canvas.yview_moveto(max(0, (row + 0.5) * self.cell - half) / pixels)
+        self.schedule_render()
+
+    def zoom(self, step):
+        """
+        Passe au niveau de zoom suivant (step > 0) ou précédent, en gardant
+        la même case au centre de la vue.
+        """
+        if not self.virtual:
+            return
+        levels = [level for level in ZOOM_LEVELS if level * self.board_size > GRID_PIXELS]
+        current = min(range(len(levels)), key=lambda i: abs(levels[i] - self.cell))
+        target = min(max(current + step, 0), len(levels) - 1)
+        if levels[target] == self.cell:
+            return
+        half = int(self.canvas.cget("width")) / 2
+        center = self.cell_at(self.canvas.canvasx(half), self.canvas.canvasy(half))
+        self.cell = levels[target]
+        self.draw_background()
+        self.center_on(*center)
+
+    # -----------------------------------------------------------------
+    # Fenêtre dessinée
+    # -----------------------------------------------------------------
+    def visible_range(self):
+        """
+        (row0, row1, col0, col1) des cases visibles, marge comprise.
+        """
+        n, cell = self.board_size, self.cell
+        size = int(self.canvas.cget("width"))
+        x, y = int(self.canvas.canvasx(0)), int(self.canvas.canvasy(0))
+        return (max(0, y // cell - RENDER_MARGIN), min(n, (y + size) // cell + 1 + RENDER_MARGIN),
+                max(0, x // cell - RENDER_MARGIN), min(n, (x + size) // cell + 1 + RENDER_MARGIN))
+
+    def schedule_render(self):
+        if self.render_id is None:
+            self.render_id = self.after_idle(self.render)
+
+    def render(self):
+        """
+        Met la fenêtre dessinée à jour après un défilement : les éléments
+        des cases sorties sont supprimés, ceux des cases entrées sont créés
+        d'après self.states.
+        """
+        self.render_id = None
+        window = self.visible_range()
+        if window != self.window:
+            self.window = window
+            row0, row1, col0, col1 = window
+            n = self.board_size
+            gone = [cell for cell in self.items
+                    if not (row0 <= cell // n < row1 and col0 <= cell % n < col1)]
+            for cell in gone:
+                self.canvas.delete(self.items.pop(cell))
+            states, items = self.states, self.items
+            for row in range(row0, row1):
+                base = row * n
+                for col in range(col0, col1):
+                    state = states.get(base + col)
+                    if state is not None and base + col not in items:
+                        self.draw_cell(row, col, state)
+        if self.virtual:
+            self.draw_minimap_frame()
+
+    def in_window(self, row, col):
+        if self.window is None:
+            return False
+        row0, row1, col0, col1 = self.window
+        return row0 <= row < row1 and col0 <= col < col1
+
+    def draw_cell(self, row, col, state):
+        x = col * self.cell + self.inset
+        y = row * self.cell + self.inset
+        self.items[row * self.board_size + col] = self.canvas.create_image(
+            x, y, image=self.tiles[state], anchor="nw")
+
+    # -----------------------------------------------------------------
+    # Minicarte
+    # -----------------------------------------------------------------
+    def create_minimap(self):
+        n = self.board_size
+        # Chaque pixel de la minicarte résume un bloc block x block de cases
+        self.block = -(-n // MINIMAP_PIXELS)
+        size = self.minimap_size = -(-n // self.block)
+        self.minimap = tk.Canvas(self, width=size, height=size, bg=self.water_color,
+                                 highlightthickness=0, borderwidth=0)
+        self.minimap.grid(row=2, column=0, columnspan=2, pady=4)
+        self.minimap_image = tk.PhotoImage(master=self, width=size, height=size)
+        self.minimap.create_image(0, 0, image=self.minimap_image, anchor="nw")
+        self.minimap_frame = self.minimap.create_rectangle(0, 0, 0, 0, outline=VIEWPORT_COLOR)
+        # Priorité de la couleur affichée par chaque pixel
+        self.minimap_levels = bytearray(size * size)
+        self.clear_minimap()
+        # Clic ou glissé sur la minicarte : la vue se centre sur ce point
+        self.minimap.bind("<Button-1>", self.on_minimap)
+        self.minimap.bind("<B1-Motion>", self.on_minimap)
+
+    def clear_minimap(self):
+        size = self.minimap_size
+        self.minimap_image.put(self.water_color, to=(0, 0, size, size))
+        self.minimap_levels[:] = bytes(len(self.minimap_levels))
+
+    def mark_minimap(self, row, col, state):
+        color, level = MINIMAP_STYLES[state]
+        x, y = col // self.block, row // self.block
+        index = y * self.minimap_size + x
+        if level > self.minimap_levels[index]:
+            self.minimap_levels[index] = level
+            self.minimap_image.put(color, to=(x, y, x + 1, y + 1))
+
+    def draw_minimap_frame(self):
+        size = self.minimap_size
+        x0, x1 = self.canvas.xview()
+        y0, y1 = self.canvas.yview()
+        self.minimap.coords(self.minimap_frame, x0 * size, y0 * size, x1 * size - 1, y1 * size - 1)
+
+    def on_minimap(self, event):
+        size = self.minimap_size
+        x, y = min(max(event.x, 0), size - 1), min(max(event.y, 0), size - 1)
+        self.center_on(y * self.block + self.block // 2, x * self.block + self.block // 2)
+
+    # -----------------------------------------------------------------
+    # Cases
+    # -----------------------------------------------------------------
+    def cell_at(self, x, y):
+        """
+        Case (row, col) sous le point (x, y) du canevas, ou None.
+        """
+        row, col = int(y) // self.cell, int(x) // self.cell
+        if 0 <= row < self.board_size and 0 <= col < self.board_size:
+            return row, col
+        return None
+
+    def on_button(self, event):
+        cell = self.cell_at(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        if cell is not None:
+            self.on_click(*cell)
+
+    def set_cell(self, row, col, state):
+        """
+        Affiche une case dans l'état SHIP, MISS, HIT, SHIP_HIT ou SUNK ; ne touche
+        au canevas que si l'état change et que la case est dans la fenêtre
+        dessinée (sinon render la dessinera en y arrivant).
+        """
+        cell = row * self.board_size + col
+        if self.states.get(cell) == state:
+            return
+        self.states[cell] = state
+        if self.virtual:
+            self.mark_minimap(row, col, state)
+        item = self.items.get(cell)
+        if item is not None:
+            self.canvas.itemconfigure(item, image=self.tiles[state])
+        elif self.in_window(row, col):
+            self.draw_cell(row, col, state)
+        else:
+            return
+        self.configure_calls += 1
+
+    def clear(self):
+        """
+        Remet toutes les cases à l'eau pour une nouvelle partie. Les
+        éléments des cases déjà dessinées sont gardés pour être réutilisés.
+        """
+        water = self.tiles[WATER]
+        for cell in self.states:
+            item = self.items.get(cell)
+            if item is not None:
+                self.canvas.itemconfigure(item, image=water)
+                self.configure_calls += 1
+        self.states.clear()
+        if self.virtual:
+            self.clear_minimap()
@@ -0,0 +1,41 @@
+from array import array
+
+
+class CellPool:
+    """
+    Ensemble des cases encore non visées d'un plateau n x n, avec tirage
+    uniforme et retrait en O(1) : un tableau des cases restantes (retrait
+    par échange avec la dernière) et l'index de chaque case dans ce tableau.
+    Tableaux compacts (array) : 8 octets par case au lieu d'un entier
+    Python par case et par tableau sur les grands plateaux.
+    """
+    __slots__ = ("size", "cells", "position")
+
+    def __init__(self, size=10):
+        self.size = size
+        self.cells = array('l', range(size * size))
+        self.position = array('l', range(size * size))  # -1 = case déjà retirée
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        row, col = cell
+        return self.position[row * self.size + col] >= 0
+
+    def draw(self, rng):
+        """
+        Renvoie une case (row, col) restante au hasard, sans la retirer.
+        """
+        return divmod(self.cells[rng.randrange(len(self.cells))], self.size)
+
+    def remove(self, row, col):
+        index = row * self.size + col
+        pos = self.position[index]
+        if pos < 0:
+            return
+        last = self.cells.pop()
+        if last != index:
+            self.cells[pos] = last
+            self.position[last] = pos
+        self.position[index] = -1
@@ -0,0 +1,41 @@
+from fleet import FLEET
+from placements import check_fleet_fits
+
+
+class GameConfig:
+    """
+    Paramètres d'une partie : taille du plateau (board_size x board_size)
+    et composition de la flotte [(nom, taille), ...], la même pour les
+    deux joueurs. Lève FleetPlacementError si la flotte ne tient pas.
+    """
+    __slots__ = ("board_size", "fleet")
+
+    def __init__(self, board_size=10, fleet=FLEET):
+        check_fleet_fits(board_size, fleet)
+        self.board_size = board_size
+        self.fleet = list(fleet)
+
+    @classmethod
+    def scaled(cls, board_size, fleet=FLEET, reference_size=10):
+        """
+        Plateau board_size avec une flotte proportionnelle à sa surface :
+        autant de copies de fleet que de plateaux reference_size x
+        reference_size y tiendraient (au moins une).
+        """
+        copies = max(1, (board_size * board_size) // (reference_size * reference_size))
+        return cls(board_size, list(fleet) * copies)
+
+    @property
+    def n_cells(self):
+        return self.board_size * self.board_size
+
+    @property
+    def ship_cells(self):
+        return sum(size for _, size in self.fleet)
+
+    def __repr__(self):
+        return f"GameConfig({self.board_size}x{self.board_size}, {len(self.fleet)} navires)"
+
+
+# Partie standard : plateau 10x10, flotte FLEET
+DEFAULT_CONFIG = GameConfig()
@@ -0,0 +1,182 @@
+"""
+Cache LRU des décisions de l'ordinateur.
+
+Clé : hash de Zobrist de ce que le tireur sait (zobrist.py), par défaut
+ramené au représentant de l'orbite de l'état par les 8 symétries du
+plateau (symmetry.py) ; valeur : la case choisie dans cet état, dans le
+repère de la clé (indice row * n + col). Les premiers coups d'une partie
+reviennent sans cesse ("aucun tir", "un raté en (4, 4)"...) : on évite de
+recalculer la carte de densité ou de rééchantillonner.
+
+Le cache est borné en mémoire (entrée la moins récemment utilisée évincée
+d'abord), compte ses succès, défauts et évictions, et peut être sauvé puis
+rechargé depuis un fichier pour démarrer "chaud".
+
+Usage : python decision_cache.py [--games N] [--dir DOSSIER] [strat ...]
+        (remplit les caches en jouant N parties, puis les sauve)
+"""
+import argparse
+import os
+import struct
+from collections import OrderedDict
+
+# Coût mémoire mesuré d'une entrée (clé 64 bits + case) dans un OrderedDict
+ENTRY_BYTES = 144
+
+# Format de fichier : en-tête (magique, version, longueur de l'étiquette,
+# nombre d'entrées), étiquette, puis (clé, case) de la moins récente à la plus récente
+MAGIC = b"BNDC"
+# Version 2 : clés de Zobrist SplitMix64 (les fichiers v1 sont refusés)
+VERSION = 2
+HEADER = struct.Struct("<4sHHI")
+ENTRY = struct.Struct("<QI")
+
+# Dossier des caches sauvés, chargés au démarrage du jeu
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "caches")
+
+
+class DecisionCache:
+    """
+    Cache LRU {hash de l'état: case choisie}, limité à max_bytes octets.
+    tag identifie la stratégie et la configuration (plateau, flotte) : un
+    fichier sauvé avec une autre étiquette est refusé au chargement.
+    symmetric : clés invariantes par symétrie du plateau.
+    """
+
+    def __init__(self, max_bytes=4 * 1024 * 1024, tag="", symmetric=True):
+        self.max_entries = max(1, max_bytes // ENTRY_BYTES)
+        self.symmetric = symmetric
+        # Les clés symétriques et ordinaires ne se mélangent pas dans un fichier
+        self.tag = tag + (":sym" if symmetric else "")
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Case mémorisée pour cet état, ou None.
+        """
+        cell = self.entries.get(key)
+        if cell is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return cell
+
+    def put(self, key, cell):
+        self.entries[key] = cell
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def memory(self):
+        """
+        Estimation de la mémoire occupée par les entrées, en octets.
+        """
+        return len(self.entries) * ENTRY_BYTES
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def describe(self):
+        return (f"{len(self)} entrées ({self.memory() / 1024:.0f} Kio), "
+                f"{self.hits} succès, {self.misses} défauts ({self.hit_rate():.1%}), "
+                f"{self.evictions} évictions")
+
+    def save(self, path):
+        tag = self.tag.encode()
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(tag), len(self.entries)))
+            f.write(tag)
+            for key, cell in self.entries.items():
+                f.write(ENTRY.pack(key, cell))
+
+    def load(self, path):
+        """
+        Ajoute les entrées d'un fichier sauvé par save(). Renvoie le nombre
+        d'entrées lues ; lève ValueError si le fichier n'est pas un cache
+        de cette stratégie.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise ValueError(f"{path} : fichier de cache tronqué")
+        magic, version, tag_length, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} : pas un fichier de cache")
+        tag = data[HEADER.size:HEADER.size + tag_length].decode()
+        if tag != self.tag:
+            raise ValueError(f"{path} : cache de « {tag} », attendu « {self.tag} »")
+        offset = HEADER.size + tag_length
+        if len(data) != offset + count * ENTRY.size:
+            raise ValueError(f"{path} : fichier de cache tronqué")
+        for key, cell in ENTRY.iter_unpack(data[offset:]):
+            self.put(key, cell)
+        return count
+
+
+def cache_tag(name, board_size, fleet):
+    """
+    Étiquette d'un cache : stratégie, taille du plateau et flotte.
+    """
+    return f"{name}:{board_size}:{','.join(str(size) for _, size in fleet)}"
+
+
+def cache_path(directory, name):
+    return os.path.join(directory, f"{name}.cache")
+
+
+def load_caches(names, board_size, fleet, directory=CACHE_DIR, max_bytes=4 * 1024 * 1024):
+    """
+    Un cache par stratégie, réchauffé depuis directory quand un fichier
+    compatible existe. Renvoie {nom: DecisionCache}.
+    """
+    caches = {}
+    for name in names:
+        cache = DecisionCache(max_bytes, cache_tag(name, board_size, fleet))
+        path = cache_path(directory, name)
+        if os.path.exists(path):
+            try:
+                cache.load(path)
+            except ValueError:
+                # Cache d'une autre version ou configuration : on repart à froid
+                cache.entries.clear()
+        caches[name] = cache
+    return caches
+
+
+def main():
+    import random
+
+    from ai import CACHED_STRATEGIES
+    from engine import BatailleNavaleEngine, DEFAULT_CONFIG
+
+    parser = argparse.ArgumentParser(description="Remplit et sauve les caches de décisions")
+    parser.add_argument("strategies", nargs="*", default=CACHED_STRATEGIES,
+                        help=f"stratégies à mettre en cache (défaut : {', '.join(CACHED_STRATEGIES)})")
+    parser.add_argument("--games", type=int, default=200, help="parties jouées par stratégie")
+    parser.add_argument("--dir", default=CACHE_DIR, help="dossier des caches")
+    args = parser.parse_args()
+
+    os.makedirs(args.dir, exist_ok=True)
+    caches = load_caches(args.strategies, DEFAULT_CONFIG.board_size, DEFAULT_CONFIG.fleet, args.dir)
+    for name in args.strategies:
+        for i in range(args.games):
+            engine = BatailleNavaleEngine(difficulty=name, rng=random.Random(i), decision_caches=caches)
+            engine.place_ships_randomly(is_player=True)
+            engine.placing_phase = False
+            while not engine.game_over:
+                engine.computer_shoot_player()
+        caches[name].save(cache_path(args.dir, name))
+        print(f"{name:10s} {caches[name].describe()}")
+
+
+if __name__ == "__main__":
+    main()
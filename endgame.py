@@ -0,0 +1,281 @@
+"""
+Solveur exact de fin de partie.
+
+Quand il ne reste qu'un ou deux navires à flot, on énumère toutes les
+positions de ces navires compatibles avec ce que le tireur sait (ratés,
+touches non résolues, navires coulés), puis on cherche le tir qui minimise
+l'espérance du nombre de tirs restants, chaque hypothèse étant équiprobable.
+
+Une hypothèse est un tuple de masques de navires ; l'état de la recherche
+est mémorisé par (hypothèses encore possibles, cases déjà visées).
+"""
+import time
+
+from board import HIT
+
+
+class SearchTimeout(Exception):
+    """
+    Levée quand la recherche dépasse son échéance.
+    """
+
+
+def enumerate_hypotheses(table, sizes, forbidden, required, limit):
+    """
+    Toutes les combinaisons de placements (une par navire de sizes) sans
+    chevauchement, hors forbidden, et couvrant toutes les cases de
+    required. Renvoie une liste de tuples de masques, ou None s'il y en a
+    plus que limit.
+    """
+    sizes = sorted(sizes, reverse=True)
+    free = [[p[3] for p in table.legal(size) if not p[3] & forbidden] for size in sizes]
+    total_cells = sum(sizes)
+    hypotheses = []
+
+    def place(depth, used, start, chosen, cells_left):
+        # Élagage : les navires restants ne suffisent plus à couvrir les touches
+        if (required & ~used).bit_count() > cells_left:
+            return True
+        if depth == len(sizes):
+            if not required & ~used:
+                hypotheses.append(tuple(chosen))
+                if len(hypotheses) > limit:
+                    return False
+            return True
+        size = sizes[depth]
+        # Navires de même taille : placements en ordre croissant (pas de doublons)
+        first = start if depth > 0 and sizes[depth - 1] == size else 0
+        candidates = free[depth]
+        for index in range(first, len(candidates)):
+            mask = candidates[index]
+            if mask & used:
+                continue
+            chosen.append(mask)
+            ok = place(depth + 1, used | mask, index + 1, chosen, cells_left - size)
+            chosen.pop()
+            if not ok:
+                return False
+        return True
+
+    if not place(0, 0, 0, [], total_cells):
+        return None
+    return hypotheses
+
+
+class EndgameSolver:
+    """
+    Choisit le tir optimal quand il reste au plus max_ships navires et au
+    plus max_hypotheses positions possibles pour eux.
+
+    Dès qu'une fin de partie est reconnue, on ouvre une "session" : les
+    hypothèses sont numérotées une fois pour toutes, et un état de la
+    recherche est le couple (masque des hypothèses encore possibles, masque
+    des cases déjà visées parmi celles des hypothèses). Les tirs réels sont
+    ensuite suivis par observe() : on descend dans l'arbre déjà exploré, et
+    la mémoïsation des coups précédents sert aux suivants.
+    """
+
+    def __init__(self, table, max_ships=2, max_hypotheses=10):
+        self.table = table
+        self.max_ships = max_ships
+        self.max_hypotheses = max_hypotheses
+        self.deadline = None
+        # Nombre d'hypothèses possibles lors de la dernière recherche
+        # interrompue : inutile de réessayer tant qu'il n'y en a pas moins
+        self.gave_up = None
+
+        # Session : navires de chaque hypothèse, union de leurs cases,
+        # hypothèses encore possibles et cases visées
+        self.ships = None
+        self.cells = None
+        self.alive = 0
+        self.shots = 0
+        self.area = 0
+        # (alive, shots) -> (espérance du nombre de tirs restants, case)
+        self.memo = {}
+
+    def start(self, sizes, forbidden, required, shots):
+        """
+        Ouvre une session si l'état est une fin de partie assez petite.
+        """
+        if not sizes or len(sizes) > self.max_ships:
+            return False
+        hypotheses = enumerate_hypotheses(self.table, sizes, forbidden, required, self.max_hypotheses)
+        if not hypotheses:
+            return False
+        self.ships = hypotheses
+        self.cells = []
+        for hypothesis in hypotheses:
+            cells = 0
+            for ship in hypothesis:
+                cells |= ship
+            self.cells.append(cells)
+        self.area = 0
+        for cells in self.cells:
+            self.area |= cells
+        self.alive = (1 << len(hypotheses)) - 1
+        self.shots = shots & self.area
+        self.memo = {}
+        self.gave_up = None
+        return True
+
+    def solve(self, sizes, forbidden, required, shots, deadline=None):
+        """
+        Renvoie la case (indice row * n + col) à viser, ou None si l'état
+        n'est pas une fin de partie que l'on sait résoudre avant l'échéance
+        deadline (time.perf_counter(), None : pas d'échéance), fixée par la
+        stratégie sur son propre budget par coup.
+
+        Une recherche interrompue n'est pas relancée au coup suivant : on
+        attend que les tirs aient éliminé des hypothèses. Ce qui a déjà été
+        exploré reste mémorisé et sert à la recherche suivante.
+        """
+        if self.ships is None and not self.start(sizes, forbidden, required, shots):
+            return None
+        alive = self.alive.bit_count()
+        if self.gave_up is not None and alive >= self.gave_up:
+            return None
+        self.deadline = deadline
+        try:
+            return self.expected(self.alive, self.shots)[1]
+        except SearchTimeout:
+            self.gave_up = alive
+            return None
+
+    def observe(self, cell, result, sunk_mask=None):
+        """
+        Suit un tir réel : ne garde que les hypothèses qui donnent la même
+        observation ("raté", "touché" ou masque du navire coulé).
+        """
+        if self.ships is None:
+            return
+        bit = 1 << cell
+        if result == HIT:
+            observation = sunk_mask if sunk_mask is not None else "touché"
+        else:
+            observation = "raté"
+        alive = 0
+        for index in self.members(self.alive):
+            if self.outcome(index, bit, self.shots) == observation:
+                alive |= 1 << index
+        self.alive = alive
+        self.shots |= bit & self.area
+        if not alive:
+            # Observation imprévue (ne devrait pas arriver) : session close
+            self.ships = None
+
+    @staticmethod
+    def members(alive):
+        index = 0
+        while alive:
+            if alive & 1:
+                yield index
+            alive >>= 1
+            index += 1
+
+    def outcome(self, index, bit, shots):
+        """
+        Observation d'un tir sur la case bit si l'hypothèse index est vraie.
+        """
+        if not self.cells[index] & bit:
+            return "raté"
+        for ship in self.ships[index]:
+            if ship & bit:
+                return ship if not ship & ~(shots | bit) else "touché"
+
+    def expected(self, alive, shots):
+        """
+        (espérance du nombre de tirs restants, meilleure case) quand les
+        hypothèses de alive sont équiprobables.
+        """
+        members = list(self.members(alive))
+        area = 0
+        for index in members:
+            area |= self.cells[index]
+        # Les tirs hors des hypothèses restantes ne changent rien à la suite
+        shots &= area
+        key = (alive, shots)
+        result = self.memo.get(key)
+        if result is not None:
+            return result
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+        if len(members) == 1:
+            # Une seule hypothèse : il suffit de tirer sur ses cases restantes
+            left = area & ~shots
+            result = (left.bit_count(), (left & -left).bit_length() - 1 if left else None)
+            self.memo[key] = result
+            return result
+
+        # Tirs probables d'abord : ils donnent vite une bonne borne
+        counts = self.cell_counts(members, shots)
+        total = len(members)
+        cells = sorted(counts, key=counts.get, reverse=True)
+        if not cells:
+            result = (0.0, None)
+            self.memo[key] = result
+            return result
+        if counts[cells[0]] == total:
+            # Touche certaine : la tirer tout de suite ne coûte jamais rien
+            cells = cells[:1]
+
+        best = None
+        seen = set()
+        for bit in cells:
+            after = shots | bit
+            outcomes = {}
+            for index in members:
+                observation = self.outcome(index, bit, shots)
+                outcomes[observation] = outcomes.get(observation, 0) | 1 << index
+            # Deux tirs qui partagent les hypothèses de la même façon se valent
+            signature = frozenset(outcomes.values())
+            if signature in seen:
+                continue
+            seen.add(signature)
+            groups = []
+            value = 1.0
+            for group in outcomes.values():
+                bound = self.lower_bound(group, after) * group.bit_count() / total
+                groups.append((group, bound))
+                value += bound
+            if best is not None and value >= best[0]:
+                continue
+            for group, bound in groups:
+                if bound:
+                    value += group.bit_count() / total * self.expected(group, after)[0] - bound
+                    if best is not None and value >= best[0]:
+                        break
+            else:
+                best = (value, bit.bit_length() - 1)
+        self.memo[key] = best
+        return best
+
+    def cell_counts(self, members, shots):
+        """
+        {bit de case: nombre d'hypothèses où elle cache une case de navire non visée}
+        """
+        counts = {}
+        for index in members:
+            left = self.cells[index] & ~shots
+            while left:
+                bit = left & -left
+                left ^= bit
+                counts[bit] = counts.get(bit, 0) + 1
+        return counts
+
+    def lower_bound(self, alive, shots):
+        """
+        Minorant de l'espérance : il faudra toucher toutes les cases
+        restantes, et le prochain tir rate au moins avec la probabilité
+        que la meilleure case soit vide.
+        """
+        result = self.memo.get((alive, shots))
+        if result is not None:
+            return result[0]
+        members = list(self.members(alive))
+        counts = self.cell_counts(members, shots)
+        if not counts:
+            return 0.0
+        total = len(members)
+        return sum(counts.values()) / total + 1 - max(counts.values()) / total
@@ -0,0 +1,333 @@
+import random
+
+from ai import STRATEGIES, make_strategy
+from board import board_class_for, SHIP, MISS, HIT
+from config import DEFAULT_CONFIG
+from fleet import Ship, Fleet
+from placements import place_fleet
+from zobrist import KnowledgeHash, get_zobrist_keys
+
+
+class ChangeSet:
+    """
+    Modifications produites par une action du moteur (placement, tir),
+    transmises en une fois à la vue :
+      - cells : {(is_player, row, col): valeur}, la dernière valeur d'une case l'emporte,
+      - sunk : [(is_player, navire)] des navires coulés.
+    """
+    __slots__ = ("cells", "sunk")
+
+    def __init__(self):
+        self.cells = {}
+        self.sunk = []
+
+    def __bool__(self):
+        return bool(self.cells or self.sunk)
+
+
+class BatailleNavaleEngine:
+    """
+    Moteur de jeu sans interface : règles, plateaux, navires et IA.
+    Aucun import de tkinter ; l'interface se branche via un callback,
+    appelé une fois à la fin de chaque placement ou tir :
+      - on_changes(changes) avec changes un ChangeSet
+    """
+
+    def __init__(self, difficulty="facile", rng=None, board_class=None,
+                 on_changes=None, decision_caches=None, opening_book=None,
+                 config=DEFAULT_CONFIG):
+        # Difficulté de l'ordinateur (nom d'une stratégie de ai.STRATEGIES)
+        self.difficulty = difficulty
+
+        # Taille du plateau et flotte (config.GameConfig)
+        self.config = config
+
+        # Représentation des plateaux (None = choisie selon la densité de la
+        # flotte : ListBoard, ou SparseBoard sur un grand plateau presque vide)
+        if board_class is None:
+            board_class = board_class_for(config.board_size, config.fleet)
+        self.board_class = board_class
+
+        # Générateur aléatoire (injectable pour des simulations reproductibles)
+        self.rng = rng if rng is not None else random.Random()
+
+        # Callback vers la vue (None = mode sans interface)
+        self.on_changes = on_changes
+
+        # Caches de décisions de l'IA par difficulté ({nom: DecisionCache}),
+        # conservés d'une partie à l'autre
+        self.decision_caches = decision_caches if decision_caches is not None else {}
+
+        # Livre d'ouvertures (opening_book.OpeningBook, ouvert par mmap) ou None
+        self.opening_book = opening_book
+
+        self.reset()
+
+    def reset(self):
+        """
+        Initialise / réinitialise tout l'état d'une partie.
+        """
+        self.placing_phase = True
+        self.game_over = False
+        self.winner = None
+
+        size = self.config.board_size
+        fleet = self.config.fleet
+
+        # Liste des navires à placer pour le joueur
+        self.ships_to_place = list(fleet)
+        self.current_ship_index = 0
+
+        # Plateaux : board[row][col] renvoie 0=vide, 1=navire, 2=raté, 3=touché
+        self.player_board = self.board_class(size, fleet)
+        self.computer_board = self.board_class(size, fleet)
+
+        # Flottes (navires + compteur de navires restants)
+        self.player_fleet = Fleet()
+        self.computer_fleet = Fleet()
+
+        # Noms des navires coulés de chaque flotte, dans l'ordre où ils ont
+        # coulé (listes complétées par update_ship_hit, jamais recalculées)
+        self.player_sunk = []
+        self.computer_sunk = []
+
+        # Hash de Zobrist de ce que chaque tireur sait du plateau adverse
+        # (cases visées et navires coulés), mis à jour à chaque tir ; celui
+        # de l'ordinateur est lu par sa stratégie, qui n'en tient pas d'autre
+        self.player_knowledge = KnowledgeHash(get_zobrist_keys(size, fleet))
+        self.computer_knowledge = STRATEGIES[self.difficulty].knowledge_hash(size, fleet)
+
+        # Stratégie de tir de l'ordinateur, selon la difficulté (voir ai.py)
+        self.computer_ai = self.make_computer_ai()
+
+        # Modifications de l'action en cours, pas encore transmises à la vue
+        self.changes = ChangeSet()
+
+        # Stats de tirs
+        self.player_hits = 0
+        self.player_misses = 0
+        self.computer_hits = 0
+        self.computer_misses = 0
+
+    def make_computer_ai(self):
+        """
+        Crée la stratégie de l'ordinateur correspondant à la difficulté.
+        """
+        return make_strategy(self.difficulty, self.rng, self.config.board_size, self.config.fleet,
+                             self.decision_caches.get(self.difficulty), self.opening_book,
+                             knowledge=self.computer_knowledge)
+
+    # ---------------------------------------------------------------------
+    # Placement
+    # ---------------------------------------------------------------------
+    def current_ship(self):
+        """
+        Renvoie (nom, taille) du prochain navire du joueur, ou None.
+        """
+        if self.current_ship_index >= len(self.ships_to_place):
+            return None
+        return self.ships_to_place[self.current_ship_index]
+
+    def place_player_ship(self, row, col, orientation):
+        """
+        Place le navire courant du joueur. Renvoie True si le placement
+        a réussi. Quand le dernier navire est posé, la flotte de
+        l'ordinateur est placée et la phase de tir commence.
+        """
+        ship = self.current_ship()
+        if ship is None:
+            return False
+
+        ship_name, ship_size = ship
+        if not self.can_place_ship(self.player_board, row, col, ship_size, orientation):
+            return False
+
+        self.set_ship(self.player_board, self.player_fleet, ship_name,
+                      row, col, ship_size, orientation, is_player=True)
+        self.current_ship_index += 1
+
+        if self.current_ship_index >= len(self.ships_to_place):
+            # Fin de placement : placement aléatoire ordi
+            self.placing_phase = False
+            self.place_computer_ships_randomly()
+        self.emit_changes()
+        return True
+
+    def can_place_ship(self, board, row, col, size, orientation):
+        return board.can_place(row, col, size, orientation)
+
+    def set_ship(self, board, fleet, name, row, col, size, orientation, is_player=False):
+        """
+        Pose un navire sur le plateau et l'ajoute à la flotte. Son indice
+        dans la flotte est inscrit dans l'index case -> navire du plateau.
+        """
+        coords = board.place(row, col, size, orientation, len(fleet))
+        fleet.add(Ship(name, size, row, col, orientation))
+
+        for (r, c) in coords:
+            self.cell_changed(is_player, r, c, SHIP)
+        return coords
+
+    def place_ships_randomly(self, is_player):
+        """
+        Place toute la flotte au hasard sur le plateau du joueur ou de l'ordi.
+        """
+        board = self.player_board if is_player else self.computer_board
+        fleet = self.player_fleet if is_player else self.computer_fleet
+        place_fleet(board, self.config.fleet, self.rng, fleet)
+        for ship in fleet:
+            for (r, c) in ship.coordinates:
+                self.cell_changed(is_player, r, c, SHIP)
+
+        if is_player:
+            self.current_ship_index = len(self.ships_to_place)
+        self.emit_changes()
+
+    def place_computer_ships_randomly(self):
+        self.place_ships_randomly(is_player=False)
+
+    # ---------------------------------------------------------------------
+    # Tirs / phase de jeu
+    # ---------------------------------------------------------------------
+    def player_shoot_computer(self, row, col):
+        """
+        Tir du joueur. Renvoie HIT, MISS, ou None si la case a déjà été visée.
+        """
+        result = self.computer_board.shoot(row, col)
+        if result is None:
+            return None
+        self.player_knowledge.shot(row, col, result)
+
+        if result == HIT:
+            # Touché
+            self.player_hits += 1
+        else:
+            # Raté
+            self.player_misses += 1
+
+        self.cell_changed(False, row, col, result)
+        if result == HIT:
+            self.update_ship_hit(self.computer_board, self.computer_fleet, row, col, is_computer=True)
+
+        # Vérifier si la partie est terminée
+        if self.all_ships_sunk(self.computer_fleet):
+            self.game_over = True
+            self.winner = "Joueur"
+        self.emit_changes()
+        return result
+
+    def computer_shoot_player(self):
+        """
+        Tir de l'ordinateur. Renvoie (row, col, résultat).
+        """
+        row, col = self.choose_computer_shot()
+
+        result = self.player_board.shoot(row, col)
+        self.computer_knowledge.shot(row, col, result)
+        sunk = None
+
+        if result == HIT:
+            # Touché
+            self.computer_hits += 1
+            self.cell_changed(True, row, col, HIT)
+            sunk = self.update_ship_hit(self.player_board, self.player_fleet, row, col, is_computer=False)
+        else:
+            # Raté (la stratégie ne vise jamais deux fois la même case)
+            self.cell_changed(True, row, col, MISS)
+            self.computer_misses += 1
+
+        # La stratégie apprend le résultat de son tir
+        self.computer_ai.record(row, col, result, sunk)
+
+        # Vérifier si la partie est terminée
+        if self.all_ships_sunk(self.player_fleet):
+            self.game_over = True
+            self.winner = "Ordinateur"
+        self.emit_changes()
+        return row, col, result
+
+    def choose_computer_shot(self):
+        return self.computer_ai.choose()
+
+    def update_ship_hit(self, board, fleet, row, col, is_computer):
+        """
+        Compte la touche sur le navire de la case, retrouvé en O(1)
+        grâce à l'index case -> navire du plateau.
+        Renvoie le navire s'il vient d'être coulé, sinon None.
+        """
+        ship = fleet.hit(board.ship_at(row, col), row, col)
+        if ship is not None:
+            # Le tireur apprend quel navire est coulé, et où
+            knowledge = self.player_knowledge if is_computer else self.computer_knowledge
+            knowledge.sink(ship)
+            sunk = self.computer_sunk if is_computer else self.player_sunk
+            sunk.append(ship.name)
+            if self.on_changes is not None:
+                self.changes.sunk.append((not is_computer, ship))
+        return ship
+
+    # ---------------------------------------------------------------------
+    # Transmission des modifications à la vue
+    # ---------------------------------------------------------------------
+    def cell_changed(self, is_player, row, col, value):
+        if self.on_changes is not None:
+            self.changes.cells[(is_player, row, col)] = value
+
+    def emit_changes(self):
+        """
+        Transmet à la vue les modifications de l'action qui se termine.
+        """
+        if self.on_changes is not None and self.changes:
+            changes, self.changes = self.changes, ChangeSet()
+            self.on_changes(changes)
+
+    def all_ships_sunk(self, fleet):
+        return fleet.all_sunk()
+
+    def sunk_ship_names(self, is_player):
+        """
+        Noms des navires coulés sur le plateau du joueur ou de l'ordinateur,
+        dans l'ordre où ils ont coulé.
+        """
+        return self.player_sunk if is_player else self.computer_sunk
+
+
+# -------------------------------------------------------------------------
+# Simulation sans interface
+# -------------------------------------------------------------------------
+def simulate_game(difficulty="facile", rng=None, board_class=None, config=DEFAULT_CONFIG):
+    """
+    Joue une partie complète sans interface : les deux flottes sont placées
+    au hasard, le "joueur" tire au hasard sur les cases non visées.
+    Renvoie le moteur en fin de partie.
+    """
+    engine = BatailleNavaleEngine(difficulty=difficulty, rng=rng, board_class=board_class, config=config)
+    engine.place_ships_randomly(is_player=True)
+    engine.placing_phase = False
+    engine.place_computer_ships_randomly()
+
+    n = config.board_size
+    targets = [(r, c) for r in range(n) for c in range(n)]
+    engine.rng.shuffle(targets)
+
+    while not engine.game_over:
+        engine.player_shoot_computer(*targets.pop())
+        if engine.game_over:
+            break
+        engine.computer_shoot_player()
+    return engine
+
+
+if __name__ == "__main__":
+    import time
+
+    n_games = 10000
+    start = time.perf_counter()
+    for difficulty in ["facile", "difficile"]:
+        wins = 0
+        for i in range(n_games // 2):
+            if simulate_game(difficulty, random.Random(i)).winner == "Ordinateur":
+                wins += 1
+        print(f"{difficulty} : l'ordinateur gagne {wins}/{n_games // 2} parties")
+    duration = time.perf_counter() - start
+    print(f"{n_games} parties en {duration:.2f} s ({n_games / duration * 60:.0f} parties/min)")
@@ -0,0 +1,99 @@
+# Flotte standard (nom, taille)
+FLEET = [
+    ("Porte-avions", 5),
+    ("Croiseur", 4),
+    ("Destroyer", 3),
+    ("Destroyer", 3),
+    ("Sous-marin", 2),
+    ("Sous-marin", 2)
+]
+
+
+class Ship:
+    """
+    Navire compact : position d'origine + orientation au lieu de la liste
+    des cases, et un masque des touches (bit i = i-ème case du navire).
+    """
+    __slots__ = ("name", "size", "row", "col", "orientation", "hit_mask")
+
+    def __init__(self, name, size, row, col, orientation):
+        self.name = name
+        self.size = size
+        self.row = row
+        self.col = col
+        self.orientation = orientation
+        self.hit_mask = 0
+
+    @property
+    def coordinates(self):
+        if self.orientation == "Horizontal":
+            return [(self.row, c) for c in range(self.col, self.col + self.size)]
+        return [(r, self.col) for r in range(self.row, self.row + self.size)]
+
+    def mask(self, board_size):
+        """
+        Masque des cases du navire (bit row * board_size + col).
+        """
+        mask = 0
+        for (r, c) in self.coordinates:
+            mask |= 1 << (r * board_size + c)
+        return mask
+
+    @property
+    def hits(self):
+        return self.hit_mask.bit_count()
+
+    @property
+    def sunk(self):
+        return self.hit_mask == (1 << self.size) - 1
+
+    def hit(self, row, col):
+        """
+        Enregistre une touche sur la case (row, col) du navire.
+        Renvoie True si ce tir vient de le couler.
+        """
+        bit = 1 << (row - self.row + col - self.col)
+        if self.hit_mask & bit:
+            return False
+        self.hit_mask |= bit
+        return self.hit_mask == (1 << self.size) - 1
+
+
+class Fleet:
+    """
+    Flotte d'un joueur : les navires dans l'ordre de placement (leur indice
+    est le numéro stocké dans l'index case -> navire du plateau) et un
+    compteur de navires restants, pour détecter la fin de partie en O(1).
+    """
+    __slots__ = ("ships", "remaining")
+
+    def __init__(self):
+        self.ships = []
+        self.remaining = 0
+
+    def __len__(self):
+        return len(self.ships)
+
+    def __iter__(self):
+        return iter(self.ships)
+
+    def __getitem__(self, ship_id):
+        return self.ships[ship_id]
+
+    def add(self, ship):
+        self.ships.append(ship)
+        self.remaining += 1
+
+    def hit(self, ship_id, row, col):
+        """
+        Touche le navire ship_id en (row, col). Renvoie le navire s'il
+        vient d'être coulé, sinon None.
+        """
+        ship = self.ships[ship_id]
+        if ship.hit(row, col):
+            self.remaining -= 1
+            return ship
+        return None
+
+    def all_sunk(self):
+        return self.remaining == 0
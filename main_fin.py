@@ -1,9 +1,26 @@
+import argparse
 import tkinter as tk
 import time
-import random
+
+from ai import CACHED_STRATEGIES
+from board_view import BoardView, SpriteAtlas, SHIP_HIT, SUNK
+from config import GameConfig
+from decision_cache import load_caches
+from engine import BatailleNavaleEngine, DEFAULT_CONFIG, SHIP, HIT
+from opening_book import load_book
+
+# Intervalle entre deux applications des mises à jour de l'affichage (~60 images/s)
+FRAME_MS = 16
+# Au-delà de ce côté, la flotte du joueur est placée au hasard (trop de
+# navires pour les poser un à un)
+MANUAL_PLACEMENT_SIZE = 20
+# Au-delà de ce côté, les IA expert et montecarlo sont désactivées : leurs
+# tables de placements ne tiennent plus en mémoire (~1 Go dès 200 x 200)
+MAX_KNOWLEDGE_SIZE = 100
+
 
 class BatailleNavaleApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, config=DEFAULT_CONFIG):
         super().__init__()
 
         # ----- Taille fixe de la fenêtre -----
@@ -13,14 +30,15 @@ class BatailleNavaleApp(tk.Tk):
 
         self.title("Bataille Navale")
 
-        # Variable qui stocke la difficulté ("facile" ou "difficile")
-        self.difficulty = None
-
-        # Indique si on est en phase de placement ou de jeu
-        self.placing_phase = True
-
-        # Indique si la partie est terminée
-        self.game_over = False
+        # Moteur de jeu (règles, plateaux, navires, IA) sans tkinter ;
+        # les caches de décisions de l'IA sont réchauffés depuis le disque
+        # et le livre d'ouvertures, s'il a été construit, est ouvert par mmap
+        self.engine = BatailleNavaleEngine(
+            on_changes=self.on_changes,
+            decision_caches=load_caches(CACHED_STRATEGIES, config.board_size, config.fleet),
+            opening_book=load_book(config.board_size, config.fleet),
+            config=config
+        )
 
         # Le joueur peut-il cliquer ? (pour bloquer les clics quand l'IA joue)
         self.player_can_play = True
@@ -32,34 +50,18 @@ class BatailleNavaleApp(tk.Tk):
         # Orientation du navire en cours de placement
         self.orientation_var = tk.StringVar(value="Horizontal")
 
-        # Liste des navires à placer pour le joueur
-        self.ships_to_place = []
-
-        # Index du navire à placer
-        self.current_ship_index = 0
-
-        # Tableaux internes : 0=vide, 1=navire, 2=raté, 3=touché
-        self.player_board = []
-        self.computer_board = []
+        # Mises à jour de l'affichage en attente, appliquées en une fois
+        # par image : état des cases {(is_player, row, col): état} et texte
+        # des labels {label: texte}
+        self.pending_cells = {}
+        self.pending_texts = {}
+        self.shown_texts = {}
+        self.flush_id = None
+        # Appels configure réellement faits sur les labels
+        self.configure_calls = 0
 
-        # Détails des navires
-        self.player_ships_details = []
-        self.computer_ships_details = []
-
-        # Ensemble des tirs déjà effectués par l’ordinateur
-        self.computer_shots_done = set()
-
-        # Stats de tirs
-        self.player_hits = 0
-        self.player_misses = 0
-        self.computer_hits = 0
-        self.computer_misses = 0
-
-        # Dernier tir réussi de l'ordi (pour la difficulté "difficile")
-        self.last_computer_hit = None
-
-        # Label indiquant le tour
-        self.turn_label_var = tk.StringVar(value="")
+        # Images des états de case, dessinées une fois pour toutes les grilles
+        self.sprites = SpriteAtlas(self)
 
         # On crée 3 frames principaux : Accueil, Jeu, Fin
         self.frameAccueil = tk.Frame(self, bg="#66B2FF")
@@ -130,8 +132,31 @@ class BatailleNavaleApp(tk.Tk):
             selectcolor="#BBDDEE",
             font=("Arial", 12)
         )
+        radio_expert = tk.Radiobutton(
+            diff_buttons_frame, text="Expert",
+            variable=self.difficulty_var, value="expert",
+            bg="#66B2FF",
+            fg="black",
+            selectcolor="#BBDDEE",
+            font=("Arial", 12)
+        )
+        radio_montecarlo = tk.Radiobutton(
+            diff_buttons_frame, text="Monte Carlo",
+            variable=self.difficulty_var, value="montecarlo",
+            bg="#66B2FF",
+            fg="black",
+            selectcolor="#BBDDEE",
+            font=("Arial", 12)
+        )
         radio_facile.pack(side="left", padx=10)
         radio_difficile.pack(side="left", padx=10)
+        radio_expert.pack(side="left", padx=10)
+        radio_montecarlo.pack(side="left", padx=10)
+
+        # Plateau trop grand pour les IA qui raisonnent sur les placements
+        if self.engine.config.board_size > MAX_KNOWLEDGE_SIZE:
+            radio_expert.config(state="disabled")
+            radio_montecarlo.config(state="disabled")
 
         # Bouton "Lancer la partie"
         start_button = tk.Button(
@@ -147,18 +172,19 @@ class BatailleNavaleApp(tk.Tk):
     def on_start_game_clicked(self):
         """
         Appelé quand on clique sur "Lancer la partie" depuis l'écran d'accueil.
-        Initialise la difficulté (facile/difficile), puis passe à l'écran de jeu.
+        Initialise la difficulté (facile/difficile/expert/montecarlo), puis passe à l'écran de jeu.
         """
-        self.difficulty = self.difficulty_var.get()  # "facile" ou "difficile"
+        self.engine.difficulty = self.difficulty_var.get()  # "facile", "difficile", "expert" ou "montecarlo"
         self.reset_game_variables()  # Initialise tous les tableaux, navires, etc.
         self.show_frame(self.frameJeu)
 
     def reset_game_variables(self):
         """
         Initialise / réinitialise toutes les variables nécessaires à la partie.
+        Les widgets de la frameJeu sont conservés d'une partie à l'autre :
+        on ne remet à zéro que leur contenu.
         """
-        self.placing_phase = True
-        self.game_over = False
+        self.engine.reset()
         self.player_can_play = True  # Le joueur peut cliquer tant qu'on n'a pas passé la main à l'IA
 
         # Chrono
@@ -168,60 +194,44 @@ class BatailleNavaleApp(tk.Tk):
         # Orientation par défaut
         self.orientation_var.set("Horizontal")
 
-        # Liste des navires à placer
-        self.ships_to_place = [
-            ("Porte-avions", 5),
-            ("Croiseur", 4),
-            ("Destroyer", 3),
-            ("Destroyer", 3),
-            ("Sous-marin", 2),
-            ("Sous-marin", 2)
-        ]
-        self.current_ship_index = 0
-
-        # Boards
-        self.player_board = [[0]*10 for _ in range(10)]
-        self.computer_board = [[0]*10 for _ in range(10)]
-
-        # Navires détaillés
-        self.player_ships_details = []
-        self.computer_ships_details = []
-
-        self.computer_shots_done = set()
-
-        # Stats de tirs
-        self.player_hits = 0
-        self.player_misses = 0
-        self.computer_hits = 0
-        self.computer_misses = 0
-
-        # Dernier tir réussi de l'ordi
-        self.last_computer_hit = None
-
-        # On nettoie tous les widgets de la frameJeu (grilles, labels, etc.)
-        for child in self.frameJeu.winfo_children():
-            child.destroy()
-
-        # On recrée la structure de la frameJeu
-        self.create_frame_jeu_content()
+        # Mises à jour de la partie précédente pas encore appliquées
+        self.pending_cells.clear()
+
+        # Grilles : seules les cases touchées pendant la partie sont effacées
+        self.player_view.clear()
+        self.computer_view.clear()
+
+        # Labels
+        self.set_info("")
+        self.set_turn("")
+        self.update_sunk_label(is_player=True)
+        self.update_sunk_label(is_player=False)
+
+        # Choix de l'orientation, masqué à la fin du placement
+        self.orientation_frame.pack(pady=5)
+
+        # Grand plateau : pas de placement à la main
+        if self.engine.config.board_size > MANUAL_PLACEMENT_SIZE:
+            self.engine.place_ships_randomly(is_player=True)
+            self.engine.placing_phase = False
+            self.engine.place_computer_ships_randomly()
+            self.start_firing("Vos navires ont été placés au hasard. Commencez à tirer sur la grille ennemie !")
 
     # ---------------------------------------------------------------------
-    # ÉCRAN DE JEU : on sépare la création en deux parties :
-    #   1) create_frame_jeu() initial (appelé dans __init__)
-    #   2) create_frame_jeu_content() qu'on appelle aussi en reset
+    # ÉCRAN DE JEU : la structure est créée une seule fois,
+    # reset_game_variables() n'en remet à zéro que le contenu
     # ---------------------------------------------------------------------
     def create_frame_jeu(self):
         """
-        Crée la frameJeu une seule fois (structure de base).
-        Mais le contenu principal (grilles, labels, etc.) est géré
-        par create_frame_jeu_content(), afin qu'on puisse le recréer au reset.
+        Crée la frameJeu une seule fois (structure de base et contenu :
+        grilles, labels, choix de l'orientation).
         """
         self.frameJeu.config(width=800, height=600)
+        self.create_frame_jeu_content()
 
     def create_frame_jeu_content(self):
         """
         Construit le contenu à l'intérieur de la frameJeu.
-        On l'appelle au lancement ET au reset.
         """
         # Label principal d'info (en haut)
         self.info_label = tk.Label(
@@ -236,7 +246,7 @@ class BatailleNavaleApp(tk.Tk):
         # Label tour
         self.turn_label = tk.Label(
             self.frameJeu,
-            textvariable=self.turn_label_var,
+            text="",
             bg="#88CCFF",
             fg="black",
             font=("Arial", 14, "bold")
@@ -252,10 +262,7 @@ class BatailleNavaleApp(tk.Tk):
         player_frame.grid(row=0, column=0, padx=20, pady=10)
 
         # Création de la grille Joueur
-        self.player_buttons_frame = tk.Frame(player_frame, bg="#88CCFF")
-        self.player_buttons_frame.pack()
-
-        self.player_buttons = self.create_grid(self.player_buttons_frame, is_player=True)
+        self.player_view = self.create_grid(player_frame, is_player=True)
 
         # Label "Bateaux coulés (Joueur)" en dessous
         self.sunk_ships_label_player = tk.Label(
@@ -274,10 +281,7 @@ class BatailleNavaleApp(tk.Tk):
         computer_frame.grid(row=0, column=1, padx=20, pady=10)
 
         # Création de la grille Ordinateur
-        self.computer_buttons_frame = tk.Frame(computer_frame, bg="#88CCFF")
-        self.computer_buttons_frame.pack()
-
-        self.computer_buttons = self.create_grid(self.computer_buttons_frame, is_player=False)
+        self.computer_view = self.create_grid(computer_frame, is_player=False)
 
         # Label "Bateaux coulés (Ordinateur)" en dessous
         self.sunk_ships_label_computer = tk.Label(
@@ -316,33 +320,21 @@ class BatailleNavaleApp(tk.Tk):
 
     def create_grid(self, parent, is_player=True):
         """
-        Crée une grille 10x10 de boutons (dans 'parent').
+        Crée la grille d'un plateau (dans 'parent') : un seul canevas,
+        à la taille du plateau.
         """
-        buttons = []
-        for row in range(10):
-            row_buttons = []
-            for col in range(10):
-                color = "#7EC8E3" if is_player else "#72B2D6"
-                btn = tk.Button(
-                    parent,
-                    width=3,
-                    height=1,
-                    bg=color,
-                    text="",
-                    font=("Arial", 10),
-                    command=lambda r=row, c=col: self.on_cell_click(r, c, is_player)
-                )
-                btn.grid(row=row, column=col, padx=1, pady=1)
-                row_buttons.append(btn)
-            buttons.append(row_buttons)
-        return buttons
+        color = "#7EC8E3" if is_player else "#72B2D6"
+        view = BoardView(parent, self.engine.config.board_size, color,
+                         lambda row, col: self.on_cell_click(row, col, is_player), self.sprites)
+        view.pack()
+        return view
 
     def on_cell_click(self, row, col, is_player):
         # Si la partie est finie ou si le joueur ne peut pas jouer (tour de l'ordi), on ignore
-        if self.game_over or not self.player_can_play:
+        if self.engine.game_over or not self.player_can_play:
             return
 
-        if self.placing_phase:
+        if self.engine.placing_phase:
             # Phase de placement
             if is_player:
                 self.place_player_ship(row, col)
@@ -358,250 +350,156 @@ class BatailleNavaleApp(tk.Tk):
 
     def place_player_ship(self, row, col):
         # Vérif si on a encore des navires à placer
-        if self.current_ship_index >= len(self.ships_to_place):
+        ship = self.engine.current_ship()
+        if ship is None:
             self.set_info("Tous vos navires sont déjà placés.")
             return
 
-        ship_name, ship_size = self.ships_to_place[self.current_ship_index]
+        ship_name, ship_size = ship
         orientation = self.orientation_var.get()  # Horizontal ou Vertical
 
-        if self.can_place_ship(self.player_board, row, col, ship_size, orientation):
-            coords = self.set_ship(self.player_board, row, col, ship_size, orientation, is_player=True)
-            # On enregistre le navire
-            self.player_ships_details.append({
-                'name': ship_name,
-                'size': ship_size,
-                'coordinates': coords,
-                'hits': 0,
-                'sunk': False
-            })
-            self.current_ship_index += 1
-
-            if self.current_ship_index >= len(self.ships_to_place):
-                # Fin de placement
-                self.placing_phase = False
-                self.set_info("Vos navires sont placés. Commencez à tirer sur la grille ennemie !")
-
-                # On supprime les widgets d'orientation
-                for widget in self.orientation_frame.winfo_children():
-                    widget.destroy()
-
-                # Placement aléatoire ordi
-                self.place_computer_ships_randomly()
-
-                # La phase de tir va commencer => on lance le chrono
-                self.start_time = time.time()
-
-                # Indique le tour
-                self.turn_label_var.set("Au tour du Joueur")
+        if self.engine.place_player_ship(row, col, orientation):
+            if not self.engine.placing_phase:
+                # Fin de placement (le moteur a placé la flotte de l'ordi)
+                self.start_firing("Vos navires sont placés. Commencez à tirer sur la grille ennemie !")
         else:
             self.set_info(f"Impossible de placer le {ship_name} ({ship_size} cases) ici.")
 
-    def can_place_ship(self, board, row, col, size, orientation):
-        if orientation == "Horizontal":
-            if col + size > 10:
-                return False
-            for c in range(col, col + size):
-                if board[row][c] != 0:
-                    return False
-        else:  # Vertical
-            if row + size > 10:
-                return False
-            for r in range(row, row + size):
-                if board[r][col] != 0:
-                    return False
-        return True
-
-    def set_ship(self, board, row, col, size, orientation, is_player=False):
-        coords = []
-        if orientation == "Horizontal":
-            for c in range(col, col + size):
-                board[row][c] = 1
-                coords.append((row, c))
-                if is_player:
-                    self.player_buttons[row][c].configure(bg="#0033CC")  # Couleur plus sombre
-        else:
-            for r in range(row, row + size):
-                board[r][col] = 1
-                coords.append((r, col))
-                if is_player:
-                    self.player_buttons[r][col].configure(bg="#0033CC")
-        return coords
-
-    def place_computer_ships_randomly(self):
-        ships = [
-            ("Porte-avions", 5),
-            ("Croiseur", 4),
-            ("Destroyer", 3),
-            ("Destroyer", 3),
-            ("Sous-marin", 2),
-            ("Sous-marin", 2)
-        ]
-        self.computer_ships_details = []
-        for name, size in ships:
-            placed = False
-            while not placed:
-                orientation = random.choice(["Horizontal", "Vertical"])
-                row = random.randint(0, 9)
-                col = random.randint(0, 9)
-                if self.can_place_ship(self.computer_board, row, col, size, orientation):
-                    coords = self.set_ship(self.computer_board, row, col, size, orientation, is_player=False)
-                    self.computer_ships_details.append({
-                        'name': name,
-                        'size': size,
-                        'coordinates': coords,
-                        'hits': 0,
-                        'sunk': False
-                    })
-                    placed = True
+    def start_firing(self, message):
+        """
+        Passe à la phase de tir, une fois les deux flottes placées.
+        """
+        self.set_info(message)
+
+        # On masque le choix d'orientation (réaffiché au reset)
+        self.orientation_frame.pack_forget()
+
+        # La phase de tir va commencer => on lance le chrono
+        self.start_time = time.time()
+
+        # Indique le tour
+        self.set_turn("Au tour du Joueur")
 
     # ---------------------------------------------------------------------
-    # Tirs / phase de jeu
+    # Tirs / phase de jeu (les règles sont dans engine.py)
     # ---------------------------------------------------------------------
     def player_shoot_computer(self, row, col):
-        if self.computer_board[row][col] in [2, 3]:
+        result = self.engine.player_shoot_computer(row, col)
+        if result is None:
             self.set_info("Vous avez déjà tiré ici.")
             return
 
         # Quand le joueur tire, on empêche de cliquer jusqu'à ce que l'ordi ait joué
         self.player_can_play = False
 
-        if self.computer_board[row][col] == 1:
-            # Touché
-            self.computer_board[row][col] = 3
-            self.computer_buttons[row][col].configure(text="X", fg="red")
-            self.player_hits += 1
-            self.update_ship_hit(self.computer_ships_details, row, col, is_computer=True)
+        if result == HIT:
             self.set_info("Touché !")
         else:
-            # Raté
-            self.computer_board[row][col] = 2
-            self.computer_buttons[row][col].configure(text="O", fg="blue")
-            self.player_misses += 1
             self.set_info("Raté...")
 
         # Vérifier si la partie est terminée
-        if self.all_ships_sunk(self.computer_ships_details):
-            self.end_game(winner="Joueur")
+        if self.engine.game_over:
+            self.end_game(winner=self.engine.winner)
             return
 
         # Sinon, c'est au tour de l'Ordinateur (on attend 0.5s)
-        self.turn_label_var.set("Au tour de l'Ordinateur")
+        self.set_turn("Au tour de l'Ordinateur")
         self.after(500, self.computer_shoot_player)
 
     def computer_shoot_player(self):
-        if self.game_over:
+        if self.engine.game_over:
             return
 
         # Ordinateur joue
-        if self.difficulty == "difficile" and self.last_computer_hit is not None:
-            row, col = self.find_adjacent_shot(*self.last_computer_hit)
-            if row is None:
-                row, col = self.random_shot()
-        else:
-            row, col = self.random_shot()
+        row, col, result = self.engine.computer_shoot_player()
 
-        self.computer_shots_done.add((row, col))
-        cell_value = self.player_board[row][col]
-
-        if cell_value == 1:
-            # Touché
-            self.player_board[row][col] = 3
-            self.player_buttons[row][col].configure(text="X", fg="red")
-            self.computer_hits += 1
-            self.update_ship_hit(self.player_ships_details, row, col, is_computer=False)
+        if result == HIT:
             self.set_info("L'Ordinateur a tiré et vous a touché !")
-
-            if self.difficulty == "difficile":
-                self.last_computer_hit = (row, col)
         else:
-            # Raté
-            if cell_value not in [2, 3]:
-                self.player_board[row][col] = 2
-                self.player_buttons[row][col].configure(text="O", fg="blue")
-            self.computer_misses += 1
             self.set_info("L'Ordinateur a tiré et a raté.")
-            if self.difficulty == "difficile":
-                self.last_computer_hit = None
 
         # Vérifier si la partie est terminée
-        if self.all_ships_sunk(self.player_ships_details):
-            self.end_game(winner="Ordinateur")
+        if self.engine.game_over:
+            self.end_game(winner=self.engine.winner)
             return
 
         # Retour au joueur
-        self.turn_label_var.set("Au tour du Joueur")
+        self.set_turn("Au tour du Joueur")
         self.player_can_play = True  # On ré-autorise le joueur à cliquer
 
-    def random_shot(self):
-        valid = False
-        row = col = 0
-        while not valid:
-            row = random.randint(0, 9)
-            col = random.randint(0, 9)
-            if (row, col) not in self.computer_shots_done:
-                valid = True
-        return (row, col)
-
-    def find_adjacent_shot(self, row, col):
-        candidates = []
-        # up
-        if row > 0 and (row-1, col) not in self.computer_shots_done:
-            candidates.append((row-1, col))
-        # down
-        if row < 9 and (row+1, col) not in self.computer_shots_done:
-            candidates.append((row+1, col))
-        # left
-        if col > 0 and (row, col-1) not in self.computer_shots_done:
-            candidates.append((row, col-1))
-        # right
-        if col < 9 and (row, col+1) not in self.computer_shots_done:
-            candidates.append((row, col+1))
-
-        if not candidates:
-            return (None, None)
-        return random.choice(candidates)
-
-    def update_ship_hit(self, ships_details, row, col, is_computer):
-        for ship in ships_details:
-            if (row, col) in ship['coordinates']:
-                ship['hits'] += 1
-                if ship['hits'] == ship['size']:
-                    ship['sunk'] = True
-                    self.reveal_sunk_ship(ship, is_computer)
-                break
-
-        self.update_sunk_labels()
-
-    def reveal_sunk_ship(self, ship, is_computer):
-        for (r, c) in ship['coordinates']:
-            if is_computer:
-                self.computer_buttons[r][c].configure(bg="dim gray", fg="white", text="X")
-            else:
-                self.player_buttons[r][c].configure(bg="dim gray", fg="white", text="X")
-
-    def update_sunk_labels(self):
-        sunk_player = [ship['name'] for ship in self.player_ships_details if ship['sunk']]
-        sunk_computer = [ship['name'] for ship in self.computer_ships_details if ship['sunk']]
-
-        if sunk_player:
-            txt_pl = "Bateaux coulés (Joueur) : " + ", ".join(sunk_player)
-        else:
-            txt_pl = "Bateaux coulés (Joueur) : (aucun)"
+    # ---------------------------------------------------------------------
+    # Mises à jour de l'affichage, regroupées et appliquées une fois par image
+    # ---------------------------------------------------------------------
+    def on_changes(self, changes):
+        """
+        Callback du moteur : note les cases modifiées par un placement ou
+        un tir (engine.ChangeSet) ; elles seront redessinées au prochain flush.
+        """
+        for (is_player, row, col), value in changes.cells.items():
+            if value == SHIP and not is_player:
+                # Seuls les navires du joueur sont visibles
+                continue
+            if value == HIT and is_player:
+                # Touche sur un navire du joueur : le navire reste visible
+                value = SHIP_HIT
+            self.pending_cells[(is_player, row, col)] = value
+        for is_player, ship in changes.sunk:
+            # Navire coulé : toutes ses cases sont grisées
+            for (r, c) in ship.coordinates:
+                self.pending_cells[(is_player, r, c)] = SUNK
+        for is_player in {is_player for is_player, _ in changes.sunk}:
+            self.update_sunk_label(is_player)
+        self.schedule_flush()
+
+    def set_text(self, label, text):
+        self.pending_texts[label] = text
+        self.schedule_flush()
+
+    def schedule_flush(self):
+        if self.flush_id is None:
+            self.flush_id = self.after(FRAME_MS, self.flush_updates)
+
+    def flush_updates(self):
+        """
+        Applique les mises à jour en attente ; les cases et labels dont
+        l'aspect ne change pas ne sont pas touchés.
+        """
+        self.flush_id = None
+        views = {True: self.player_view, False: self.computer_view}
+        for (is_player, row, col), state in self.pending_cells.items():
+            views[is_player].set_cell(row, col, state)
+        self.pending_cells.clear()
+        for label, text in self.pending_texts.items():
+            if self.shown_texts.get(label) != text:
+                label.config(text=text)
+                self.shown_texts[label] = text
+                self.configure_calls += 1
+        self.pending_texts.clear()
+
+    def count_configure_calls(self):
+        """
+        Appels configure faits sur les labels et les grilles depuis le lancement.
+        """
+        return self.configure_calls + self.player_view.configure_calls + self.computer_view.configure_calls
 
-        if sunk_computer:
-            txt_co = "Bateaux coulés (Ordinateur) : " + ", ".join(sunk_computer)
+    def update_sunk_label(self, is_player):
+        """
+        Label des navires coulés d'un camp, lu dans la liste tenue par le
+        moteur ; appelé seulement quand un navire de ce camp coule.
+        """
+        sunk = self.engine.sunk_ship_names(is_player)
+        if is_player:
+            label, side = self.sunk_ships_label_player, "Joueur"
         else:
-            txt_co = "Bateaux coulés (Ordinateur) : (aucun)"
-
-        self.sunk_ships_label_player.config(text=txt_pl)
-        self.sunk_ships_label_computer.config(text=txt_co)
-
-    def all_ships_sunk(self, ships_details):
-        return all(ship['sunk'] for ship in ships_details)
+            label, side = self.sunk_ships_label_computer, "Ordinateur"
+        names = ", ".join(sunk) if sunk else "(aucun)"
+        self.set_text(label, f"Bateaux coulés ({side}) : {names}")
 
     def set_info(self, message):
-        self.info_label.config(text=message)
+        self.set_text(self.info_label, message)
+
+    def set_turn(self, message):
+        self.set_text(self.turn_label, message)
 
     # ---------------------------------------------------------------------
     # ÉCRAN DE FIN
@@ -653,7 +551,6 @@ class BatailleNavaleApp(tk.Tk):
         self.end_quit_button.pack(side="left", padx=10)
 
     def end_game(self, winner):
-        self.game_over = True
         self.end_time = time.time()
 
         # On calcule la durée
@@ -667,12 +564,12 @@ class BatailleNavaleApp(tk.Tk):
 
         info_text.append("")
         info_text.append("Statistiques de tir :")
-        info_text.append(f"  Joueur : {self.player_hits} touches / {self.player_misses} ratés")
-        info_text.append(f"  Ordinateur : {self.computer_hits} touches / {self.computer_misses} ratés")
+        info_text.append(f"  Joueur : {self.engine.player_hits} touches / {self.engine.player_misses} ratés")
+        info_text.append(f"  Ordinateur : {self.engine.computer_hits} touches / {self.engine.computer_misses} ratés")
 
-        # Navires coulés
-        sunk_player = [ship['name'] for ship in self.player_ships_details if ship['sunk']]
-        sunk_computer = [ship['name'] for ship in self.computer_ships_details if ship['sunk']]
+        # Navires coulés (listes tenues par le moteur)
+        sunk_player = self.engine.player_sunk
+        sunk_computer = self.engine.computer_sunk
 
         info_text.append("")
         info_text.append("Navires coulés par le Joueur : " + ", ".join(sunk_computer) if sunk_computer else "Navires coulés par le Joueur : (aucun)")
@@ -701,5 +598,13 @@ class BatailleNavaleApp(tk.Tk):
 # Lancement de l'application
 # -------------------------------------------------------------------------
 if __name__ == "__main__":
-    app = BatailleNavaleApp()
+    # python main_fin.py [--size N] : plateau N x N, flotte proportionnelle
+    # à sa surface (au-delà de 33 x 33, la grille défile et se zoome ;
+    # au-delà de MANUAL_PLACEMENT_SIZE, la flotte du joueur est placée au
+    # hasard ; au-delà de MAX_KNOWLEDGE_SIZE, seules facile et difficile)
+    parser = argparse.ArgumentParser(description="Bataille navale")
+    parser.add_argument("--size", type=int, default=DEFAULT_CONFIG.board_size,
+                        help="côté du plateau (flotte proportionnelle à la surface)")
+    args = parser.parse_args()
+    app = BatailleNavaleApp(GameConfig.scaled(args.size))
     app.mainloop()
@@ -0,0 +1,165 @@
+"""
+Livre d'ouvertures de l'ordinateur, lu en mémoire partagée (mmap).
+
+Construit hors ligne : on joue des parties contre des flottes tirées au
+hasard avec l'IA la plus rapide ("expert", carte de densité incrémentale)
+et on note, pour chaque état de connaissance rencontré pendant les depth
+premiers coups, la case choisie. Les états sont identifiés par leur clé
+invariante par symétrie (symmetry.CanonicalKnowledgeHash) et la case est
+stockée dans le repère de cette clé.
+
+Fichier : un en-tête, une étiquette (plateau et flotte), puis des
+enregistrements (clé 64 bits, case) triés par clé. Le jeu l'ouvre avec
+mmap et y cherche par dichotomie : rien n'est copié en mémoire, et les
+processus qui ouvrent le même livre partagent les mêmes pages.
+
+Usage : python opening_book.py [--games N] [--depth D] [--min-visits V] [--out FICHIER]
+"""
+import argparse
+import mmap
+import os
+import random
+import struct
+
+from decision_cache import CACHE_DIR
+
+MAGIC = b"BNOB"
+# Version 2 : clés de Zobrist SplitMix64 (les fichiers v1 sont refusés)
+VERSION = 2
+HEADER = struct.Struct("<4sHHHI")   # magique, version, profondeur, longueur de l'étiquette, nombre
+RECORD = struct.Struct("<QI")       # clé, case
+
+# Livre chargé au démarrage du jeu
+BOOK_PATH = os.path.join(CACHE_DIR, "opening.book")
+
+
+def book_tag(board_size, fleet):
+    return f"{board_size}:{','.join(str(size) for _, size in fleet)}"
+
+
+class OpeningBook:
+    """
+    Livre ouvert en lecture seule par mmap ; lookup(clé) en O(log n)
+    sans rien copier. Lève ValueError si le fichier n'est pas un livre
+    pour ce plateau et cette flotte.
+    """
+
+    def __init__(self, path, board_size, fleet):
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} : livre d'ouvertures tronqué")
+        magic, version, self.depth, tag_length, self.count = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} : pas un livre d'ouvertures")
+        tag = self.data[HEADER.size:HEADER.size + tag_length].decode()
+        if tag != book_tag(board_size, fleet):
+            self.close()
+            raise ValueError(f"{path} : livre pour « {tag} », attendu « {book_tag(board_size, fleet)} »")
+        self.offset = HEADER.size + tag_length
+        if len(self.data) != self.offset + self.count * RECORD.size:
+            self.close()
+            raise ValueError(f"{path} : livre d'ouvertures tronqué")
+
+    def __len__(self):
+        return self.count
+
+    def lookup(self, key):
+        """
+        Case (dans le repère de la clé) jouée dans cet état, ou None.
+        """
+        data = self.data
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            record_key, cell = RECORD.unpack_from(data, self.offset + middle * RECORD.size)
+            if record_key < key:
+                low = middle + 1
+            elif record_key > key:
+                high = middle
+            else:
+                return cell
+        return None
+
+    def close(self):
+        self.data.close()
+
+
+def load_book(board_size, fleet, path=BOOK_PATH):
+    """
+    Livre d'ouvertures s'il existe et correspond au plateau, sinon None.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        return OpeningBook(path, board_size, fleet)
+    except ValueError:
+        return None
+
+
+def build_book(n_games, depth, min_visits=2, board_size=10, fleet=None, seed=0):
+    """
+    Joue n_games parties avec l'IA expert et renvoie {clé: case} des états
+    vus au moins min_visits fois pendant les depth premiers coups. Dans un
+    état déjà vu, on rejoue la même case : le livre reste un arbre cohérent.
+    """
+    from ai import DensityStrategy
+    from board import BitBoard, HIT
+    from fleet import FLEET
+    from placements import place_fleet
+
+    fleet = fleet if fleet is not None else FLEET
+    rng = random.Random(seed)
+    moves = {}
+    visits = {}
+    for _ in range(n_games):
+        board = BitBoard(board_size, fleet)
+        ships = place_fleet(board, fleet, rng)
+        strategy = DensityStrategy(rng, board_size, fleet, endgame=False)
+        symmetry = strategy.knowledge.symmetry
+        for _ in range(depth):
+            if ships.all_sunk():
+                break
+            key, t = strategy.knowledge.canonical()
+            if key in moves:
+                row, col = divmod(symmetry.cell_maps[symmetry.inverse[t]][moves[key]], board_size)
+            else:
+                row, col = strategy.choose_shot()
+                moves[key] = symmetry.cell_maps[t][row * board_size + col]
+            visits[key] = visits.get(key, 0) + 1
+            result = board.shoot(row, col)
+            sunk = ships.hit(board.ship_at(row, col), row, col) if result == HIT else None
+            strategy.record(row, col, result, sunk)
+    return {key: cell for key, cell in moves.items() if visits[key] >= min_visits}
+
+
+def write_book(path, book, depth, board_size, fleet):
+    tag = book_tag(board_size, fleet).encode()
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, depth, len(tag), len(book)))
+        f.write(tag)
+        for key in sorted(book):
+            f.write(RECORD.pack(key, book[key]))
+
+
+def main():
+    from config import DEFAULT_CONFIG
+
+    parser = argparse.ArgumentParser(description="Construit le livre d'ouvertures de l'ordinateur")
+    parser.add_argument("--games", type=int, default=20000, help="parties explorées")
+    parser.add_argument("--depth", type=int, default=15, help="coups couverts par le livre")
+    parser.add_argument("--min-visits", type=int, default=2, help="visites minimales d'un état gardé")
+    parser.add_argument("--out", default=BOOK_PATH, help="fichier du livre")
+    args = parser.parse_args()
+
+    size, fleet = DEFAULT_CONFIG.board_size, DEFAULT_CONFIG.fleet
+    book = build_book(args.games, args.depth, args.min_visits, size, fleet)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    write_book(args.out, book, args.depth, size, fleet)
+    print(f"{len(book)} états sur {args.depth} coups -> {args.out} ({os.path.getsize(args.out)} octets)")
+
+
+if __name__ == "__main__":
+    main()
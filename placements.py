@@ -0,0 +1,498 @@
+import random
+
+from fleet import Fleet, Ship
+
+ORIENTATIONS = ["Horizontal", "Vertical"]
+
+# Au-delà de cette taille, on ne construit pas de table complète pour tirer
+# une flotte : ses masques pèseraient des centaines de Mo (voir sample_fleet)
+SMALL_BOARD = 32
+
+
+class PlacementTable:
+    """
+    Table précalculée des placements d'un plateau board_size x board_size :
+    pour chaque (taille, orientation, row, col), le masque des cases
+    couvertes (bit row * board_size + col), ou 0 si le navire dépasse.
+    Les tailles sont construites à la demande puis gardées en cache.
+    """
+
+    def __init__(self, board_size):
+        self.board_size = board_size
+        # taille -> {orientation: [masque pour chaque row * n + col]}
+        self.by_size = {}
+        # taille -> [(orientation, row, col, masque, cases)] des placements légaux,
+        # cases étant le tuple des indices row * n + col couverts
+        self.legal_by_size = {}
+        # taille -> pour chaque case, indices (dans legal) des placements qui la couvrent
+        self.covering_by_size = {}
+
+    def masks(self, size, orientation):
+        """
+        Liste des masques indexée par row * board_size + col.
+        """
+        if size not in self.by_size:
+            self.build(size)
+        return self.by_size[size][orientation]
+
+    def legal(self, size):
+        """
+        Tous les placements dans les limites du plateau pour cette taille.
+        """
+        if size not in self.legal_by_size:
+            self.build(size)
+        return self.legal_by_size[size]
+
+    def covering(self, size):
+        """
+        Index inverse : pour chaque case row * n + col, la liste des indices
+        dans legal(size) des placements qui la couvrent.
+        """
+        if size not in self.covering_by_size:
+            covering = [[] for _ in range(self.board_size * self.board_size)]
+            for placement_id, placement in enumerate(self.legal(size)):
+                for cell in placement[4]:
+                    covering[cell].append(placement_id)
+            self.covering_by_size[size] = covering
+        return self.covering_by_size[size]
+
+    def mask(self, size, orientation, row, col):
+        """
+        Masque d'un placement (0 s'il sort du plateau). Si la taille n'est
+        pas encore dans la table, il est calculé sans la construire.
+        """
+        if size in self.by_size:
+            return self.by_size[size][orientation][row * self.board_size + col]
+        return placement_mask(self.board_size, size, orientation, row, col)
+
+    def build(self, size):
+        n = self.board_size
+        column = 0
+        for r in range(size):
+            column |= 1 << (r * n)
+        line = (1 << size) - 1
+
+        horizontal = [0] * (n * n)
+        vertical = [0] * (n * n)
+        legal = []
+        for row in range(n):
+            for col in range(n):
+                index = row * n + col
+                if col + size <= n:
+                    horizontal[index] = line << index
+                    cells = tuple(range(index, index + size))
+                    legal.append(("Horizontal", row, col, horizontal[index], cells))
+                if row + size <= n:
+                    vertical[index] = column << index
+                    cells = tuple(range(index, index + size * n, n))
+                    legal.append(("Vertical", row, col, vertical[index], cells))
+
+        self.by_size[size] = {"Horizontal": horizontal, "Vertical": vertical}
+        self.legal_by_size[size] = legal
+
+
+def placement_mask(board_size, size, orientation, row, col):
+    """
+    Masque d'un placement calculé directement, ou 0 s'il sort du plateau.
+    """
+    n = board_size
+    if orientation == "Horizontal":
+        if col + size > n:
+            return 0
+        return ((1 << size) - 1) << (row * n + col)
+    if row + size > n:
+        return 0
+    # Colonne construite près du bit 0 puis décalée une seule fois : sur un
+    # grand plateau, chaque opération sur le masque complet coûte cher
+    column = 0
+    for k in range(size):
+        column |= 1 << (k * n)
+    return column << (row * n + col)
+
+
+# Une table par taille de plateau, partagée par tous les plateaux
+_tables = {}
+
+
+def get_placement_table(board_size, fleet=None):
+    """
+    Renvoie la table partagée pour board_size, en précalculant les tailles
+    de la flotte [(nom, taille), ...] si elle est fournie et que le
+    plateau est petit (sur un grand plateau, les tailles sont construites
+    seulement si une IA en a besoin).
+    """
+    table = _tables.get(board_size)
+    if table is None:
+        table = _tables[board_size] = PlacementTable(board_size)
+    if fleet is not None and board_size <= SMALL_BOARD:
+        for _, size in fleet:
+            table.masks(size, "Horizontal")
+    return table
+
+
+class FleetPlacementError(Exception):
+    """
+    Levée quand une flotte ne peut pas être placée sur le plateau.
+    """
+
+
+class FleetSearchAbandoned(FleetPlacementError):
+    """
+    Levée quand la recherche d'une flotte s'arrête faute d'essais (max_steps)
+    sans avoir prouvé que la flotte est impossible.
+    """
+
+
+def check_fleet_fits(board_size, fleet):
+    """
+    Rejette d'emblée les flottes évidemment impossibles.
+    """
+    for name, size in fleet:
+        if size > board_size:
+            raise FleetPlacementError(f"{name} ({size} cases) dépasse un plateau {board_size}x{board_size}")
+    total = sum(size for _, size in fleet)
+    if total > board_size * board_size:
+        raise FleetPlacementError(f"La flotte occupe {total} cases, le plateau n'en a que {board_size * board_size}")
+
+
+# Tentatives de tirage uniforme avant la recherche complète (search_fleet)
+RANDOM_ATTEMPTS = 3
+
+
+def generate_fleet(board_size, fleet, rng=random, occupied=0, max_steps=None):
+    """
+    Tire une flotte [(nom, taille), ...] sans boucle de rejet infinie :
+    pour chaque navire (du plus grand au plus petit), on tire uniformément
+    parmi les placements encore libres ; si un navire n'a plus de place,
+    on revient sur le navire précédent (backtracking), et on repart de
+    zéro quand une tentative s'enlise. Après RANDOM_ATTEMPTS tentatives
+    (flotte dense), la recherche complète search_fleet prend le relais.
+
+    occupied : masque des cases interdites.
+    Renvoie [(orientation, row, col, masque, cases), ...] dans l'ordre de fleet.
+    Lève FleetPlacementError si la flotte est impossible, et
+    FleetSearchAbandoned si max_steps placements (None : pas de limite)
+    ont été essayés sans trouver de flotte ni prouver qu'il n'y en a pas.
+    Sur un grand plateau sans cases interdites, voir sample_fleet.
+    """
+    check_fleet_fits(board_size, fleet)
+    if board_size > SMALL_BOARD and not occupied:
+        try:
+            return sample_fleet(board_size, fleet, rng, max_steps or 100000)
+        except FleetSearchAbandoned:
+            return search_fleet(board_size, fleet, rng, occupied, max_steps)
+    steps = RANDOM_ATTEMPTS * restart_steps(fleet)
+    if max_steps is not None:
+        steps = min(steps, max_steps)
+    result = draw_fleet(board_size, fleet, rng, occupied, steps)
+    if result is not None:
+        return result
+    return search_fleet(board_size, fleet, rng, occupied, None if max_steps is None else max_steps - steps)
+
+
+def restart_steps(fleet):
+    """
+    Placements essayés par une tentative de draw_fleet avant de repartir de zéro.
+    """
+    return 2 * len(fleet) + 20
+
+
+def draw_fleet(board_size, fleet, rng=random, occupied=0, max_steps=200):
+    """
+    Tirage uniforme de generate_fleet seul, en tentatives successives de
+    restart_steps(fleet) placements : renvoie la flotte, ou None après
+    max_steps placements ou si la flotte est impossible.
+    """
+    table = get_placement_table(board_size, fleet)
+    order = sorted(range(len(fleet)), key=lambda i: -fleet[i][1])
+    legal = [table.legal(fleet[i][1]) for i in order]
+
+    steps = 0
+    while steps < max_steps:
+        attempt = min(restart_steps(fleet), max_steps - steps)
+        try:
+            chosen = attempt_fleet(legal, occupied, rng, attempt)
+        except FleetPlacementError:
+            return None
+        if chosen is not None:
+            result = [None] * len(fleet)
+            for i, placement in zip(order, chosen):
+                result[i] = placement
+            return result
+        steps += attempt
+    return None
+
+
+def search_fleet(board_size, fleet, rng=random, occupied=0, max_steps=None):
+    """
+    Recherche complète d'une flotte, case par case : la première case pas
+    encore décidée (dans l'ordre row * n + col) est soit laissée vide, soit
+    le début d'un navire horizontal ou vertical, toutes les cases avant
+    elle étant décidées. Toute flotte est atteinte ainsi : l'arbre épuisé,
+    la flotte est impossible. Les navires sont essayés avant la case vide,
+    dans un ordre aléatoire (tirage non uniforme, pour les flottes denses).
+
+    Mêmes arguments, résultat et exceptions que generate_fleet ; le masque
+    de chaque placement vaut None au-delà de SMALL_BOARD.
+    """
+    n = board_size
+    decided = bytearray(n * n)
+    while occupied:
+        low = occupied & -occupied
+        decided[low.bit_length() - 1] = 1
+        occupied ^= low
+    # Navires restants : taille -> indices dans fleet
+    remaining = {}
+    for i, (_, size) in enumerate(fleet):
+        remaining.setdefault(size, []).append(i)
+    empties = decided.count(0) - sum(size for _, size in fleet)
+    if empties < 0:
+        raise FleetPlacementError("Aucun placement possible pour cette flotte")
+
+    result = [None] * len(fleet)
+    placed = 0
+    # Pile de choix : [case, options restantes, choix en cours]
+    # (option : (orientation, taille, cases), ou None pour laisser la case vide)
+    stack = []
+    cursor = 0
+    steps = 0
+    while placed < len(fleet):
+        while cursor < n * n and decided[cursor]:
+            cursor += 1
+        options = []
+        if cursor < n * n:
+            row, col = divmod(cursor, n)
+            for size, indices in remaining.items():
+                if not indices:
+                    continue
+                if col + size <= n and not any(decided[cursor:cursor + size]):
+                    options.append(("Horizontal", size, range(cursor, cursor + size)))
+                if size > 1 and row + size <= n and not any(decided[cursor:cursor + size * n:n]):
+                    options.append(("Vertical", size, range(cursor, cursor + size * n, n)))
+            rng.shuffle(options)
+            if empties:
+                options.insert(0, None)
+        stack.append([cursor, options, None])
+
+        # Choix suivant, en revenant sur les cases précédentes si besoin
+        while True:
+            if not stack:
+                raise FleetPlacementError("Aucun placement possible pour cette flotte")
+            frame = stack[-1]
+            cursor, options, current = frame
+            # Annulation du choix précédent à cette case
+            if current == "empty":
+                decided[cursor] = 0
+                empties += 1
+            elif current is not None:
+                _, size, cells, i = current
+                for cell in cells:
+                    decided[cell] = 0
+                remaining[size].append(i)
+                result[i] = None
+                placed -= 1
+            frame[2] = None
+            if not options:
+                stack.pop()
+                continue
+            steps += 1
+            if max_steps is not None and steps > max_steps:
+                raise FleetSearchAbandoned(f"Flotte non placée après {max_steps} essais")
+            option = options.pop()
+            if option is None:
+                decided[cursor] = 1
+                empties -= 1
+                frame[2] = "empty"
+            else:
+                orientation, size, cells = option
+                for cell in cells:
+                    decided[cell] = 1
+                i = remaining[size].pop()
+                row, col = divmod(cursor, n)
+                mask = placement_mask(n, size, orientation, row, col) if n <= SMALL_BOARD else None
+                result[i] = (orientation, row, col, mask, tuple(cells))
+                placed += 1
+                frame[2] = (orientation, size, cells, i)
+            break
+    return result
+
+
+def place_fleet(board, fleet, rng=random, ships=None):
+    """
+    Tire la flotte [(nom, taille), ...] (generate_fleet) et la pose sur
+    board, plateau vide. Renvoie la Fleet des navires posés (ships, complétée,
+    si elle est donnée) : le numéro de chaque navire dans l'index
+    case -> navire du plateau est son indice dans cette flotte.
+    """
+    ships = ships if ships is not None else Fleet()
+    for (name, size), (orientation, row, col, _, _) in zip(fleet, generate_fleet(board.size, fleet, rng)):
+        board.place(row, col, size, orientation, len(ships))
+        ships.add(Ship(name, size, row, col, orientation))
+    return ships
+
+
+def sample_fleet(board_size, fleet, rng=random, max_steps=100000):
+    """
+    Tirage d'une flotte sur un grand plateau, sans table de placements :
+    chaque navire (du plus grand au plus petit) est tiré uniformément
+    jusqu'à tomber sur des cases libres (occupation dans un bytearray).
+    Sur un plateau peu rempli, il suffit de quelques essais par navire.
+    Le masque de chaque placement vaut None : sur un plateau 1000x1000,
+    un seul masque pèserait jusqu'à 125 ko.
+    Lève FleetSearchAbandoned après max(max_steps, 100 par navire) essais.
+    """
+    n = board_size
+    occupied = bytearray(n * n)
+    result = [None] * len(fleet)
+    budget = max(max_steps, 100 * len(fleet))
+    for i in sorted(range(len(fleet)), key=lambda i: -fleet[i][1]):
+        size = fleet[i][1]
+        while True:
+            budget -= 1
+            if budget < 0:
+                raise FleetSearchAbandoned(f"Flotte non placée après {max(max_steps, 100 * len(fleet))} essais")
+            if rng.randrange(2) == 0:
+                orientation = "Horizontal"
+                row, col, step = rng.randrange(n), rng.randrange(n - size + 1), 1
+            else:
+                orientation = "Vertical"
+                row, col, step = rng.randrange(n - size + 1), rng.randrange(n), n
+            start = row * n + col
+            cells = range(start, start + size * step, step)
+            if not any(occupied[cell] for cell in cells):
+                break
+        for cell in cells:
+            occupied[cell] = 1
+        result[i] = (orientation, row, col, None, tuple(cells))
+    return result
+
+
+def attempt_fleet(legal, occupied, rng, max_steps):
+    """
+    Une tentative de placement en profondeur (voir generate_fleet).
+    legal[d] : placements dans les limites du plateau du d-ième navire.
+    Renvoie la liste des placements choisis, None si max_steps est
+    atteint, et lève FleetPlacementError si l'arbre de recherche est
+    épuisé (aucune solution).
+    """
+    candidates = []      # placements libres restants, par profondeur (None = pas encore énumérés)
+    tried = []           # placements déjà essayés avant énumération
+    chosen = []
+    masks = [occupied]   # occupation après chaque navire posé
+    steps = 0
+    while len(chosen) < len(legal):
+        depth = len(chosen)
+        used = masks[-1]
+        if depth == len(candidates):
+            candidates.append(None)
+            tried.append([])
+            # Quelques tirages directs : uniformes parmi les placements libres
+            for _ in range(8):
+                placement = legal[depth][rng.randrange(len(legal[depth]))]
+                if not placement[3] & used:
+                    break
+            else:
+                placement = None
+            if placement is not None:
+                tried[depth].append(placement)
+                chosen.append(placement)
+                masks.append(used | placement[3])
+                continue
+
+        remaining = candidates[depth]
+        if remaining is None:
+            # Énumération des placements libres (hors ceux déjà essayés)
+            remaining = [p for p in legal[depth] if not p[3] & used and p not in tried[depth]]
+            candidates[depth] = remaining
+
+        if not remaining:
+            # Plus de place pour ce navire : on revient au précédent
+            candidates.pop()
+            tried.pop()
+            if depth == 0:
+                raise FleetPlacementError("Aucun placement possible pour cette flotte")
+            chosen.pop()
+            masks.pop()
+            continue
+
+        steps += 1
+        if steps > max_steps:
+            return None
+
+        # Tirage uniforme puis retrait en O(1) (échange avec le dernier)
+        k = rng.randrange(len(remaining))
+        remaining[k], remaining[-1] = remaining[-1], remaining[k]
+        placement = remaining.pop()
+        chosen.append(placement)
+        masks.append(used | placement[3])
+    return chosen
+
+
+def generate_fleets(board_size, fleet, n, rng=random):
+    """
+    Génère n flottes indépendantes (pour les simulations en lot).
+    """
+    for _ in range(n):
+        yield generate_fleet(board_size, fleet, rng)
+
+
+def generate_consistent_fleet(board_size, fleet, rng=random, forbidden=0, required=0, max_steps=200):
+    """
+    Tire une flotte [(nom, taille), ...] compatible avec ce que le tireur
+    sait : aucune case de forbidden (ratés, navires coulés) et toutes les
+    cases de required (touches non résolues) couvertes.
+
+    Plutôt que de rejeter les flottes qui ne couvrent pas les touches, on
+    place d'abord, pour chaque touche non couverte, un navire choisi parmi
+    les placements qui passent par elle (index inverse de la table), puis
+    les navires restants par le tirage uniforme draw_fleet (la recherche
+    complète de generate_fleet fausserait l'échantillon).
+    Renvoie [(orientation, row, col, masque, cases), ...] (ordre quelconque),
+    ou None si aucun tirage n'a abouti en max_steps essais.
+    """
+    table = get_placement_table(board_size, fleet)
+    sizes = sorted((size for _, size in fleet), reverse=True)
+    covered = cover_required(table, sizes, forbidden, required, rng, [max_steps])
+    if covered is None:
+        return None
+    placements, rest = covered
+
+    occupied = forbidden
+    for placement in placements:
+        occupied |= placement[3]
+    rest = draw_fleet(board_size, [("", size) for size in rest], rng, occupied, max_steps)
+    if rest is None:
+        return None
+    return placements + rest
+
+
+def cover_required(table, sizes, blocked, uncovered, rng, budget):
+    """
+    Couvre récursivement les cases de uncovered avec des navires de sizes.
+    budget est une liste [essais restants] partagée par toute la recherche.
+    Renvoie (placements, tailles restantes) ou None.
+    """
+    if not uncovered:
+        return [], sizes
+    # Première touche non couverte
+    cell = (uncovered & -uncovered).bit_length() - 1
+    options = []
+    for size in set(sizes):
+        legal = table.legal(size)
+        for placement_id in table.covering(size)[cell]:
+            placement = legal[placement_id]
+            if not placement[3] & blocked:
+                options.append((size, placement))
+    rng.shuffle(options)
+
+    for size, placement in options:
+        budget[0] -= 1
+        if budget[0] < 0:
+            return None
+        rest = list(sizes)
+        rest.remove(size)
+        result = cover_required(table, rest, blocked | placement[3], uncovered & ~placement[3], rng, budget)
+        if result is not None:
+            placements, left = result
+            return [placement] + placements, left
+    return None
@@ -0,0 +1,171 @@
+"""
+Symétries du plateau carré (groupe diédral : 4 rotations x miroir).
+
+Les règles et la flotte ne dépendent pas de l'orientation du plateau :
+deux états de connaissance images l'un de l'autre par une symétrie
+appellent la même décision, à la symétrie près. On ramène donc un état
+au représentant de son orbite (le plus petit de ses 8 transformés) pour
+partager caches et livre d'ouvertures, et on transforme la case choisie
+en retour.
+
+Une symétrie t (0 à 7) applique, dans cet ordre : miroir des colonnes si
+t & 1, miroir des lignes si t & 2, transposition si t & 4. Les masques
+sont transformés par décalages de bandes entières (colonnes, lignes,
+diagonales), en O(n) opérations sur des entiers et non case par case.
+"""
+from placements import ORIENTATIONS
+from zobrist import get_zobrist_keys
+
+N_SYMMETRIES = 8
+
+
+class Symmetry:
+    """
+    Transformations des masques et des cases d'un plateau board_size x board_size.
+    """
+
+    def __init__(self, board_size):
+        n = board_size
+        self.board_size = n
+        row = (1 << n) - 1
+        column = 0
+        for r in range(n):
+            column |= 1 << (r * n)
+        self.rows = [row << (r * n) for r in range(n)]
+        self.columns = [column << c for c in range(n)]
+        # Diagonales c - r = k (k de -(n-1) à n-1) : la transposition les
+        # décale d'un bloc de k * (n - 1) positions
+        self.diagonals = []
+        for k in range(-(n - 1), n):
+            mask = 0
+            for r in range(n):
+                if 0 <= r + k < n:
+                    mask |= 1 << (r * n + r + k)
+            self.diagonals.append((k * (n - 1), mask))
+
+        # Image de chaque case par chaque symétrie, et symétrie inverse
+        self.cell_maps = [[self.transform_cell(cell, t) for cell in range(n * n)]
+                          for t in range(N_SYMMETRIES)]
+        identity = self.cell_maps[0]
+        self.inverse = [
+            next(u for u in range(N_SYMMETRIES)
+                 if [self.cell_maps[u][self.cell_maps[t][cell]] for cell in range(n * n)] == identity)
+            for t in range(N_SYMMETRIES)
+        ]
+
+    def transform_cell(self, cell, t):
+        n = self.board_size
+        row, col = divmod(cell, n)
+        if t & 1:
+            col = n - 1 - col
+        if t & 2:
+            row = n - 1 - row
+        if t & 4:
+            row, col = col, row
+        return row * n + col
+
+    def flip_columns(self, mask):
+        n = self.board_size
+        result = 0
+        for c, column in enumerate(self.columns):
+            shift = n - 1 - 2 * c
+            part = mask & column
+            result |= part << shift if shift >= 0 else part >> -shift
+        return result
+
+    def flip_rows(self, mask):
+        n = self.board_size
+        result = 0
+        for r, row in enumerate(self.rows):
+            shift = (n - 1 - 2 * r) * n
+            part = mask & row
+            result |= part << shift if shift >= 0 else part >> -shift
+        return result
+
+    def transpose(self, mask):
+        result = 0
+        for shift, diagonal in self.diagonals:
+            part = mask & diagonal
+            result |= part << shift if shift >= 0 else part >> -shift
+        return result
+
+    def transform(self, mask, t):
+        if t & 1:
+            mask = self.flip_columns(mask)
+        if t & 2:
+            mask = self.flip_rows(mask)
+        if t & 4:
+            mask = self.transpose(mask)
+        return mask
+
+    def canonical(self, misses, hits, sunk=()):
+        """
+        Représentant de l'orbite d'un état (ratés, touches, masques des
+        navires coulés) : le plus petit des 8 transformés. Renvoie
+        (représentant, t) où t envoie l'état sur son représentant.
+        """
+        best = None
+        for t in range(N_SYMMETRIES):
+            image = (self.transform(misses, t), self.transform(hits, t),
+                     tuple(sorted(self.transform(ship, t) for ship in sunk)))
+            if best is None or image < best[0]:
+                best = (image, t)
+        return best
+
+
+# Cache des symétries par taille de plateau
+_symmetries = {}
+
+
+def get_symmetry(board_size):
+    if board_size not in _symmetries:
+        _symmetries[board_size] = Symmetry(board_size)
+    return _symmetries[board_size]
+
+
+class CanonicalKnowledgeHash:
+    """
+    Hashs de Zobrist de la connaissance du tireur dans les 8 repères du
+    plateau, tenus à jour en O(8) par tir. Le plus petit est une clé
+    invariante par symétrie ; values[0] est le hash ordinaire
+    (zobrist.KnowledgeHash).
+    """
+    __slots__ = ("keys", "symmetry", "values")
+
+    def __init__(self, board_size, fleet):
+        self.keys = get_zobrist_keys(board_size, fleet)
+        self.symmetry = get_symmetry(board_size)
+        self.values = [0] * N_SYMMETRIES
+
+    def shot(self, row, col, result):
+        cell = row * self.symmetry.board_size + col
+        keys = self.keys.cells[result]
+        values = self.values
+        for t, cell_map in enumerate(self.symmetry.cell_maps):
+            values[t] ^= keys[cell_map[cell]]
+
+    def sink(self, ship):
+        mask = ship.mask(self.symmetry.board_size)
+        sunk_keys = self.keys.sunk[ship.size]
+        for t in range(N_SYMMETRIES):
+            image = self.symmetry.transform(mask, t)
+            origin = (image & -image).bit_length() - 1
+            # Navire horizontal : sa deuxième case suit l'origine sur la ligne
+            orientation = ORIENTATIONS[0] if image >> (origin + 1) & 1 else ORIENTATIONS[1]
+            self.values[t] ^= sunk_keys[orientation][origin]
+
+    @property
+    def value(self):
+        """
+        Hash ordinaire (même valeur que zobrist.KnowledgeHash).
+        """
+        return self.values[0]
+
+    def canonical(self):
+        """
+        (clé invariante par symétrie, t) : t envoie l'état courant dans le
+        repère de la clé.
+        """
+        values = self.values
+        t = min(range(N_SYMMETRIES), key=values.__getitem__)
+        return values[t], t
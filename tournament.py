@@ -0,0 +1,231 @@
+"""
+Tournoi entre stratégies de tir de l'ordinateur (voir ai.STRATEGIES).
+
+Chaque paire de stratégies joue M parties (mêmes graines pour toutes les
+paires) ; les parties sont découpées en lots répartis sur un pool de
+processus. Résultat : taux de victoire et nombre moyen de tirs pour
+gagner, avec intervalles de confiance à 95 %.
+
+Avec --book, chaque processus ouvre le livre d'ouvertures par mmap : les
+pages du fichier sont partagées entre processus au lieu d'être copiées.
+Avec --size N, on joue sur un plateau N x N avec une flotte proportionnelle
+à sa surface (config.GameConfig.scaled).
+
+Usage : python tournament.py [--games M] [--workers P] [--chunk N] [--seed S] [--book FICHIER]
+                             [--size N] [strat ...]
+"""
+import argparse
+import itertools
+import math
+import multiprocessing
+import random
+import time
+
+from ai import STRATEGIES, make_strategy
+from board import HIT, board_class_for
+from config import DEFAULT_CONFIG, GameConfig
+from opening_book import OpeningBook
+from placements import place_fleet
+
+# Quantile de la loi normale pour un intervalle de confiance à 95 %
+Z_95 = 1.96
+
+# Options des stratégies pendant le tournoi : pas d'échéance en temps réel,
+# pour qu'une graine donne toujours la même partie quelle que soit la
+# charge de la machine (montecarlo : nombre fixe d'échantillons par coup)
+STRATEGY_OPTIONS = {
+    "expert": {"budget": None},
+    "montecarlo": {"budget": None, "max_samples": 200},
+}
+
+
+class Side:
+    """
+    Un camp : son plateau, sa flotte, et la stratégie qui tire sur l'adversaire.
+    """
+
+    def __init__(self, strategy_name, rng, book=None, config=DEFAULT_CONFIG):
+        size, composition = config.board_size, config.fleet
+        self.board = board_class_for(size, composition)(size, composition)
+        self.fleet = place_fleet(self.board, composition, rng)
+        self.strategy = make_strategy(strategy_name, rng, size, composition, book=book,
+                                      **STRATEGY_OPTIONS.get(strategy_name, {}))
+        self.shots = 0
+
+    def fire_at(self, other):
+        """
+        Un tir sur le camp adverse. Renvoie True si sa flotte est coulée.
+        """
+        row, col = self.strategy.choose()
+        result = other.board.shoot(row, col)
+        if result is None:
+            raise ValueError(f"{self.strategy.name} a visé deux fois la case {(row, col)}")
+        sunk = None
+        if result == HIT:
+            sunk = other.fleet.hit(other.board.ship_at(row, col), row, col)
+        self.strategy.record(row, col, result, sunk)
+        self.shots += 1
+        return other.fleet.all_sunk()
+
+
+def play_duel(name_a, name_b, seed, book=None, config=DEFAULT_CONFIG):
+    """
+    Joue une partie A contre B. Le premier à tirer alterne avec la graine.
+    Renvoie (A a gagné, tirs du vainqueur).
+    """
+    rng = random.Random(seed)
+    side_a = Side(name_a, rng, book, config)
+    side_b = Side(name_b, rng, book, config)
+    shooter, target = (side_a, side_b) if seed % 2 == 0 else (side_b, side_a)
+    while not shooter.fire_at(target):
+        shooter, target = target, shooter
+    return shooter is side_a, shooter.shots
+
+
+# Livres ouverts dans ce processus, par chemin (un seul mmap par processus)
+_books = {}
+
+
+def open_book(path, config=DEFAULT_CONFIG):
+    if path is None:
+        return None
+    if path not in _books:
+        _books[path] = OpeningBook(path, config.board_size, config.fleet)
+    return _books[path]
+
+
+def play_chunk(task):
+    """
+    Unité de travail : count parties de la paire (A, B) à partir de first_seed.
+    Renvoie (A, B, parties, victoires de A, somme et somme des carrés des
+    tirs du vainqueur, pour A puis pour B).
+    """
+    name_a, name_b, first_seed, count, book_path, config = task
+    book = open_book(book_path, config)
+    wins_a = 0
+    shots = {True: [0, 0], False: [0, 0]}
+    for seed in range(first_seed, first_seed + count):
+        a_won, winner_shots = play_duel(name_a, name_b, seed, book, config)
+        wins_a += a_won
+        shots[a_won][0] += winner_shots
+        shots[a_won][1] += winner_shots * winner_shots
+    return name_a, name_b, count, wins_a, shots[True], shots[False]
+
+
+def wilson_interval(successes, n, z=Z_95):
+    """
+    Intervalle de confiance de Wilson pour une proportion.
+    """
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denominator = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return centre - margin, centre + margin
+
+
+def mean_interval(total, total_sq, n, z=Z_95):
+    """
+    Moyenne et demi-largeur de l'intervalle de confiance (approximation normale).
+    """
+    if n == 0:
+        return float("nan"), float("nan")
+    mean = total / n
+    if n == 1:
+        return mean, float("nan")
+    variance = max(total_sq - n * mean * mean, 0.0) / (n - 1)
+    return mean, z * math.sqrt(variance / n)
+
+
+class Tally:
+    """
+    Cumul des résultats d'une paire ou d'une stratégie.
+    """
+
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.win_shots = 0
+        self.win_shots_sq = 0
+
+    def add(self, games, wins, shots):
+        self.games += games
+        self.wins += wins
+        self.win_shots += shots[0]
+        self.win_shots_sq += shots[1]
+
+    def describe(self):
+        low, high = wilson_interval(self.wins, self.games)
+        text = f"{self.wins / self.games:6.1%} [{low:6.1%} ; {high:6.1%}]"
+        if self.wins < 2:
+            return text
+        mean, margin = mean_interval(self.win_shots, self.win_shots_sq, self.wins)
+        return f"{text}   {mean:5.1f} ± {margin:4.1f} tirs"
+
+
+def make_tasks(names, n_games, chunk_size, seed, book_path=None, config=DEFAULT_CONFIG):
+    tasks = []
+    for name_a, name_b in itertools.combinations(names, 2):
+        for first in range(0, n_games, chunk_size):
+            tasks.append((name_a, name_b, seed + first, min(chunk_size, n_games - first), book_path, config))
+    return tasks
+
+
+def run_tournament(names, n_games, workers=None, chunk_size=500, seed=0, book_path=None,
+                   config=DEFAULT_CONFIG):
+    """
+    Joue toutes les paires et renvoie {(A, B): Tally de A} et {nom: Tally}.
+    """
+    tasks = make_tasks(names, n_games, chunk_size, seed, book_path, config)
+    pairs = {}
+    totals = {name: Tally() for name in names}
+    with multiprocessing.Pool(workers) as pool:
+        for name_a, name_b, count, wins_a, shots_a, shots_b in pool.imap_unordered(play_chunk, tasks):
+            pairs.setdefault((name_a, name_b), Tally()).add(count, wins_a, shots_a)
+            totals[name_a].add(count, wins_a, shots_a)
+            totals[name_b].add(count, count - wins_a, shots_b)
+    return pairs, totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tournoi entre stratégies de l'ordinateur")
+    parser.add_argument("strategies", nargs="*", default=list(STRATEGIES),
+                        help="stratégies à opposer (défaut : toutes)")
+    parser.add_argument("--games", type=int, default=10000, help="parties par paire")
+    parser.add_argument("--workers", type=int, default=None, help="processus (défaut : nombre de cœurs)")
+    parser.add_argument("--chunk", type=int, default=500, help="parties par unité de travail")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--book", default=None, help="livre d'ouvertures (opening_book.py)")
+    parser.add_argument("--size", type=int, default=DEFAULT_CONFIG.board_size,
+                        help="côté du plateau (flotte proportionnelle à la surface)")
+    args = parser.parse_args()
+
+    if len(args.strategies) < 2:
+        parser.error("il faut au moins deux stratégies")
+    for name in args.strategies:
+        if name not in STRATEGIES:
+            parser.error(f"stratégie inconnue : {name} (disponibles : {', '.join(STRATEGIES)})")
+
+    config = GameConfig.scaled(args.size)
+    start = time.perf_counter()
+    pairs, totals = run_tournament(args.strategies, args.games, args.workers, args.chunk, args.seed,
+                                   args.book, config)
+    duration = time.perf_counter() - start
+
+    print("Par paire (victoires de A, IC 95 %, tirs moyens du vainqueur A) :")
+    for (name_a, name_b), tally in sorted(pairs.items()):
+        print(f"  {name_a:>12s} contre {name_b:<12s} {tally.describe()}")
+    print()
+    print("Par stratégie (victoires, IC 95 %, tirs moyens pour gagner) :")
+    for name in args.strategies:
+        print(f"  {name:>12s} {totals[name].describe()}")
+
+    n_total = sum(tally.games for tally in pairs.values())
+    print()
+    print(f"{n_total} parties en {duration:.1f} s ({n_total / duration:.0f} parties/s, "
+          f"{args.workers or multiprocessing.cpu_count()} processus)")
+
+
+if __name__ == "__main__":
+    main()
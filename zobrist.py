@@ -0,0 +1,109 @@
+"""
+Hachage de Zobrist de ce que le tireur sait d'un plateau.
+
+La connaissance du tireur, c'est l'état visible de chaque case (raté ou
+touché ; les cases non visées et les navires intacts ne se distinguent
+pas) et les navires coulés. Chaque (case, état visible) et chaque
+(taille, orientation, case d'origine) de navire coulé a une clé
+pseudo-aléatoire de 64 bits : le hash d'un état est le XOR des clés qui
+le décrivent, et chaque tir ou navire coulé le met à jour en O(1) par un
+seul XOR.
+"""
+from board import MISS, HIT
+from placements import ORIENTATIONS
+
+# Graine fixe : les hashs sont reproductibles d'un processus à l'autre
+ZOBRIST_SEED = 0x5EED
+MASK64 = (1 << 64) - 1
+
+# Au-delà, les clés sont calculées à la demande au lieu d'être tabulées
+# (un plateau 1000x1000 demanderait des dizaines de millions de clés)
+MAX_TABULATED_CELLS = 10000
+
+
+def splitmix64(x):
+    """
+    Mélangeur SplitMix64 : entier 64 bits pseudo-aléatoire déterminé par x.
+    """
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+class KeyStream:
+    """
+    Suite de clés indexée par case, calculée à la demande.
+    """
+    __slots__ = ("base",)
+
+    def __init__(self, base):
+        self.base = base
+
+    def __getitem__(self, cell):
+        return splitmix64(self.base + cell)
+
+
+def key_table(stream, n_cells):
+    """
+    Clés de stream pour les n_cells cases : une liste si le plateau est
+    petit (accès plus rapide), sinon la suite calculée à la demande.
+    """
+    base = splitmix64(ZOBRIST_SEED ^ stream) << 24
+    if n_cells <= MAX_TABULATED_CELLS:
+        return [splitmix64(base + cell) for cell in range(n_cells)]
+    return KeyStream(base)
+
+
+class ZobristKeys:
+    """
+    Clés aléatoires 64 bits d'un plateau board_size x board_size et d'une flotte.
+    """
+
+    def __init__(self, board_size, fleet):
+        n_cells = board_size * board_size
+        self.board_size = board_size
+        # état visible -> clé de chaque case row * n + col
+        self.cells = {state: key_table(state, n_cells) for state in (MISS, HIT)}
+        # taille -> orientation -> clé de chaque case d'origine
+        self.sunk = {}
+        for size in sorted({size for _, size in fleet}):
+            self.sunk[size] = {
+                orientation: key_table((size << 8) | (index + 4), n_cells)
+                for index, orientation in enumerate(ORIENTATIONS)
+            }
+
+    def shot_key(self, row, col, result):
+        return self.cells[result][row * self.board_size + col]
+
+    def sunk_key(self, ship):
+        return self.sunk[ship.size][ship.orientation][ship.row * self.board_size + ship.col]
+
+
+# Cache des clés par (taille du plateau, tailles de la flotte)
+_keys = {}
+
+
+def get_zobrist_keys(board_size, fleet):
+    key = (board_size, tuple(sorted(size for _, size in fleet)))
+    if key not in _keys:
+        _keys[key] = ZobristKeys(board_size, fleet)
+    return _keys[key]
+
+
+class KnowledgeHash:
+    """
+    Hash 64 bits, tenu à jour tir par tir, de ce que le tireur sait d'un plateau.
+    """
+    __slots__ = ("keys", "value")
+
+    def __init__(self, keys):
+        self.keys = keys
+        # Aucun tir : hash nul
+        self.value = 0
+
+    def shot(self, row, col, result):
+        self.value ^= self.keys.shot_key(row, col, result)
+
+    def sink(self, ship):
+        self.value ^= self.keys.sunk_key(ship)